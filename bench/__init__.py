@@ -0,0 +1,3 @@
+# hismedi-app/bench/__init__.py
+# -*- coding: utf-8 -*-
+"""오프라인 벤치마크 스위트(python -m bench.run)."""
@@ -0,0 +1,139 @@
+# hismedi-app/bench/fakes.py
+# -*- coding: utf-8 -*-
+"""네트워크 대체물: 메모리 워크시트(gspread 호환 부분집합) + 로컬 HTTP 서버."""
+
+import re, hashlib, threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_A1 = re.compile(r"([A-Z]+)(\d*)(?::([A-Z]+)(\d*))?")
+
+
+def _col(letters: str) -> int:
+    n = 0
+    for ch in letters:
+        n = n * 26 + ord(ch) - 64
+    return n - 1
+
+
+class FakeWorksheet:
+    """scraper / gsheet / state / snapshot이 쓰는 메서드만 구현. calls에 호출 기록."""
+
+    def __init__(self, rows=None, title: str = "news"):
+        self.title = title
+        self.rows = [list(r) for r in (rows or [])]
+        self.calls = []
+
+    def _range(self, rng: str):
+        m = _A1.fullmatch(rng)
+        if not m:
+            raise ValueError(f"unsupported range: {rng}")
+        c1, r1, c2, r2 = m.groups()
+        c2 = c2 or c1
+        r1 = int(r1 or 1)
+        if m.group(3) is None:
+            r2 = r1
+        else:
+            r2 = int(r2) if r2 else len(self.rows)
+        out = []
+        for row in self.rows[r1 - 1:r2]:
+            cells = row[_col(c1):_col(c2) + 1]
+            while cells and cells[-1] == "":
+                cells.pop()
+            out.append(cells)
+        while out and not out[-1]:
+            out.pop()
+        return out
+
+    def get_all_values(self, **kw):
+        self.calls.append(("get_all_values",))
+        return [list(r) for r in self.rows]
+
+    def get(self, rng: str, **kw):
+        self.calls.append(("get", rng))
+        return self._range(rng)
+
+    def batch_get(self, ranges, **kw):
+        self.calls.append(("batch_get", tuple(ranges)))
+        return [self._range(r) for r in ranges]
+
+    def append_row(self, row, **kw):
+        self.calls.append(("append_row",))
+        self.rows.append(list(row))
+
+    def append_rows(self, rows, **kw):
+        self.calls.append(("append_rows", len(rows)))
+        self.rows.extend(list(r) for r in rows)
+
+    def update(self, rng: str, values, **kw):
+        self.calls.append(("update", rng))
+        m = re.fullmatch(r"([A-Z]+)(\d+)", rng)
+        c, r = _col(m.group(1)), int(m.group(2)) - 1
+        while len(self.rows) <= r:
+            self.rows.append([])
+        row = self.rows[r]
+        while len(row) <= c:
+            row.append("")
+        row[c] = values[0][0]
+
+    def batch_update(self, data, **kw):
+        self.calls.append(("batch_update", len(data)))
+        for d in data:
+            self.update(d["range"], d["values"])
+
+
+class FixtureServer:
+    """경로 → (content_type, body)를 응답하는 로컬 HTTP 서버(ETag / If-None-Match → 304 지원).
+
+    with FixtureServer(routes) as srv:
+        srv.url("/rss/0.xml")
+    """
+
+    def __init__(self, routes: dict):
+        self.routes = dict(routes)
+        self.hits = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                server.hits += 1
+                entry = server.routes.get(self.path)
+                if entry is None:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                ctype, body = entry
+                etag = '"%s"' % hashlib.md5(body).hexdigest()
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", ctype)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    def url(self, path: str) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}{path}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._httpd.shutdown()
+        self._httpd.server_close()
@@ -0,0 +1,179 @@
+# hismedi-app/bench/fixtures.py
+# -*- coding: utf-8 -*-
+"""벤치마크 입력 데이터.
+
+- 피드/게시판 본문: bench/fixtures/ 아래 녹화본이 있으면 그것을, 없으면 같은 형식의 합성 본문을 씀
+  (녹화: python -m bench.run --record — 실제 사이트에 접속하므로 필요할 때만)
+- NEWS 시트: NEWS_HEADERS 10열 합성 행(제목 해시/SimHash는 스크레이퍼와 같은 함수로 계산)
+모든 합성 데이터는 seed로 고정되어 커밋 간 비교가 가능합니다.
+"""
+
+import os, random, hashlib
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from xml.sax.saxutils import escape
+
+from news.config import KEYWORDS, NEGATIVE_HINTS, RSS_SOURCES, BOARD_SOURCES
+from news.gsheet import NEWS_HEADERS
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+BOARD_PAGES = 3
+
+_FILLER = [
+    "정부", "발표", "추진", "확대", "개편", "논란", "검토", "강화", "지역", "대책", "현장", "전망",
+    "올해", "내년", "시행", "협의", "개선", "발의", "국회", "예산", "지원", "대응", "점검", "위원회",
+]
+_KEYWORDS = sorted({kw for kws in KEYWORDS.values() for kw in kws})
+BASE_TIME = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _slug(s: str) -> str:
+    return hashlib.md5(s.encode("utf-8")).hexdigest()[:10]
+
+def feed_fixture_path(index: int, feed_url: str) -> str:
+    return os.path.join(FIXTURE_DIR, "rss", f"{index:02d}_{_slug(feed_url)}.xml")
+
+def board_fixture_path(key: str, page: int) -> str:
+    return os.path.join(FIXTURE_DIR, "boards", f"{key}_{page}.html")
+
+
+# ----------------------------
+# 합성 데이터
+# ----------------------------
+def synthetic_titles(n: int, seed: int = 0, tagged_ratio: float = 0.6):
+    """키워드가 섞인(약 tagged_ratio) 한국어 제목 n개."""
+    rng = random.Random(seed)
+    out = []
+    for i in range(n):
+        words = rng.choices(_FILLER, k=rng.randint(4, 8))
+        if rng.random() < tagged_ratio:
+            for _ in range(rng.randint(1, 2)):
+                words.insert(rng.randrange(len(words) + 1), rng.choice(_KEYWORDS))
+        if rng.random() < 0.03:
+            words.append(rng.choice(NEGATIVE_HINTS))
+        out.append(" ".join(words) + f" ({i})")
+    return out
+
+def synthetic_feed(source: str, index: int, n: int = 50, seed: int = 0) -> bytes:
+    """RSS 2.0 / Atom / RSS 1.0을 index에 따라 번갈아 생성(Google News는 항상 RSS 2.0)."""
+    titles = synthetic_titles(n, seed=seed * 1000 + index)
+    base = BASE_TIME + timedelta(days=index)
+    host = f"feed{index}.example.kr"
+    kind = "rss2" if "news.google.com" in source or index % 3 == 0 else ("atom" if index % 3 == 1 else "rss1")
+    items = []
+    for i, t in enumerate(titles):
+        ts = base - timedelta(minutes=17 * i)
+        link = escape(f"https://{host}/news/articleView.html?idxno={index * 10000 + i}&utm_source=rss")
+        if kind == "atom":
+            items.append(f"<entry><title>{escape(t)}</title><link rel='alternate' href='{link}'/>"
+                         f"<published>{ts.isoformat()}</published><id>{link}</id></entry>")
+        elif kind == "rss1":
+            items.append(f"<item rdf:about='{link}'><title>{escape(t)}</title><link>{link}</link>"
+                         f"<dc:date>{ts.isoformat()}</dc:date></item>")
+        else:
+            items.append(f"<item><title>{escape(t)}</title><link>{link}</link>"
+                         f"<pubDate>{format_datetime(ts, usegmt=True)}</pubDate></item>")
+    body = "".join(items)
+    if kind == "atom":
+        doc = f"<?xml version='1.0' encoding='utf-8'?><feed xmlns='http://www.w3.org/2005/Atom'><title>{escape(source)}</title>{body}</feed>"
+    elif kind == "rss1":
+        doc = ("<?xml version='1.0' encoding='utf-8'?><rdf:RDF xmlns:rdf='http://www.w3.org/1999/02/22-rdf-syntax-ns#' "
+               "xmlns='http://purl.org/rss/1.0/' xmlns:dc='http://purl.org/dc/elements/1.1/'>"
+               f"<channel><title>{escape(source)}</title></channel>{body}</rdf:RDF>")
+    else:
+        doc = f"<?xml version='1.0' encoding='utf-8'?><rss version='2.0'><channel><title>{escape(source)}</title>{body}</channel></rss>"
+    return doc.encode("utf-8")
+
+def synthetic_board_page(key: str, page: int, rows: int = 10, seed: int = 0) -> bytes:
+    spec = BOARD_SOURCES[key]
+    titles = synthetic_titles(rows, seed=seed * 1000 + 500 + page, tagged_ratio=0.8)
+    trs = []
+    for i, t in enumerate(titles):
+        no = 10000 - (page - 1) * rows - i
+        day = (BASE_TIME - timedelta(days=(page - 1) * 3 + i // 4)).strftime("%Y.%m.%d")
+        href = f"/news/enews/report/enewsView.do?news_seq={no}" if key == "moel" else f"/board.es?mid=a10503010100&bid=0027&act=view&list_no={no}"
+        trs.append(f"<tr><td>{no}</td><td class='title'><a href='{escape(href)}'>{escape(t)}</a></td>"
+                   f"<td>{escape(spec['source'])}</td><td>{day}</td></tr>")
+    html = ("<html><head><meta charset='utf-8'></head><body><table><thead><tr><th>번호</th><th>제목</th>"
+            f"<th>담당</th><th>등록일</th></tr></thead><tbody>{''.join(trs)}</tbody></table></body></html>")
+    return html.encode("utf-8")
+
+def news_rows(n: int, seed: int = 0):
+    """NEWS_HEADERS + n행(오래된 것부터). 약 2%는 앞 행의 근접 중복 제목."""
+    from news.scraper import normalize_ws, sha256_hex, simhash64_batch
+
+    titles = synthetic_titles(n, seed=seed + 7)
+    rng = random.Random(seed)
+    for i in range(1, n):
+        if rng.random() < 0.02:
+            titles[i] = titles[rng.randrange(i)] + " 외"
+    sims = simhash64_batch(titles)
+    start = BASE_TIME - timedelta(minutes=9 * n)
+    sources = [name for name, _ in RSS_SOURCES]
+    rows = [list(NEWS_HEADERS)]
+    for i, (t, sim) in enumerate(zip(titles, sims)):
+        url = f"https://news{i % 7}.example.kr/article/{seed}/{i}"
+        rows.append([
+            (start + timedelta(minutes=9 * i)).isoformat(),
+            sources[i % len(sources)],
+            t,
+            url,
+            url,
+            rng.choice(list(KEYWORDS)),
+            sha256_hex(normalize_ws(t).lower()),
+            sim,
+            "",
+            (start + timedelta(minutes=9 * i)).isoformat(),
+        ])
+    return rows
+
+
+# ----------------------------
+# 녹화본 우선 로드 / 녹화
+# ----------------------------
+def _read(path: str):
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+def feed_bodies(seed: int = 0):
+    """RSS_SOURCES 순서대로 [(source, feed_url, body, recorded)] (HTML: 소스 제외)."""
+    out = []
+    for i, (source, feed_url) in enumerate(RSS_SOURCES):
+        if feed_url.startswith("HTML:"):
+            continue
+        body = _read(feed_fixture_path(i, feed_url))
+        out.append((source, feed_url, body or synthetic_feed(feed_url, i, seed=seed), body is not None))
+    return out
+
+def board_bodies(seed: int = 0, pages: int = BOARD_PAGES):
+    """{(key, page): (body, recorded)}"""
+    out = {}
+    for key in BOARD_SOURCES:
+        for p in range(1, pages + 1):
+            body = _read(board_fixture_path(key, p))
+            out[(key, p)] = (body or synthetic_board_page(key, p, seed=seed), body is not None)
+    return out
+
+def record(pages: int = BOARD_PAGES):
+    """실제 피드/게시판 응답을 bench/fixtures/에 저장(실패한 소스는 건너뜀)."""
+    from news.config import DEFAULTS
+    from news.transport import fetch
+
+    saved = 0
+    targets = [(feed_fixture_path(i, u), u) for i, (_, u) in enumerate(RSS_SOURCES) if not u.startswith("HTML:")]
+    targets += [(board_fixture_path(k, p), spec["list_url"].format(page=p)) for k, spec in BOARD_SOURCES.items()
+                for p in range(1, pages + 1)]
+    for path, url in targets:
+        try:
+            body = fetch(url, ua=DEFAULTS["user_agent"], timeout_sec=15, retries=1).content
+        except Exception as e:
+            print(f"skip {url}: {e!r}")
+            continue
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(body)
+        saved += 1
+    return saved
@@ -0,0 +1,299 @@
+# hismedi-app/bench/run.py
+# -*- coding: utf-8 -*-
+"""오프라인 벤치마크(라이브 시트/뉴스 사이트 없이 핫 패스 측정).
+
+사용:
+    python -m bench.run --rows 10000 --out bench.json
+    python -m bench.run --rows 100000 --only dashboard --compare bench.json --threshold 1.2
+    python -m bench.run --record          # 실제 피드/게시판을 bench/fixtures/에 녹화
+
+- 네트워크: FixtureServer(로컬 HTTP, ETag/304 지원) / 시트: FakeWorksheet
+- 결과: JSON {"meta": {...}, "results": [{name, n, repeat, min_ms, median_ms, mean_ms, per_item_us}, ...]}
+- --compare: 이전 결과와 median 비율 출력, --threshold를 넘는 항목이 있으면 종료 코드 1
+"""
+
+import os, sys, json, time, shutil, argparse, platform, statistics, subprocess, tempfile
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+from bench import fixtures
+from bench.fakes import FakeWorksheet, FixtureServer
+from news import scraper
+from news.config import KEYWORDS, BOARD_SOURCES, DEFAULTS
+from news.gsheet import META_HEADERS, MetaSession
+from news.httpcache import ValidatorCache
+from news.simindex import SimHashIndex
+from news.state import DedupStore
+from news.storage import LocalStorage, SheetStorage
+from news.transport import configure_fetch_limits
+
+
+def measure(name: str, fn, n: int, repeat: int, setup=None) -> dict:
+    """setup()의 반환값을 fn에 넘겨 repeat회 측정(setup 시간은 제외)."""
+    times = []
+    for _ in range(repeat):
+        arg = setup() if setup else None
+        t0 = time.perf_counter()
+        fn(arg)
+        times.append(time.perf_counter() - t0)
+    med = statistics.median(times)
+    return {
+        "name": name,
+        "n": n,
+        "repeat": repeat,
+        "min_ms": round(min(times) * 1000, 3),
+        "median_ms": round(med * 1000, 3),
+        "mean_ms": round(statistics.fmean(times) * 1000, 3),
+        "per_item_us": round(med / max(1, n) * 1e6, 3),
+    }
+
+
+# ----------------------------
+# collect_rss / 파싱
+# ----------------------------
+@contextmanager
+def local_sources(seed: int):
+    """RSS_SOURCES / BOARD_SOURCES를 로컬 서버 주소로 바꿔 끼움(같은 피드 URL은 같은 경로)."""
+    feeds = fixtures.feed_bodies(seed)
+    boards = fixtures.board_bodies(seed)
+    routes, paths = {}, {}
+    for source, feed_url, body, _ in feeds:
+        path = paths.setdefault(feed_url, f"/rss/{len(paths)}")
+        routes[path] = ("application/rss+xml; charset=utf-8", body)
+    for (key, page), (body, _) in boards.items():
+        routes[f"/board/{key}/{page}"] = ("text/html; charset=utf-8", body)
+
+    saved = scraper.RSS_SOURCES, scraper.BOARD_SOURCES
+    with FixtureServer(routes) as srv:
+        scraper.RSS_SOURCES = [(source, srv.url(paths[feed_url])) for source, feed_url, _, _ in feeds]
+        scraper.RSS_SOURCES += [(spec["source"], f"HTML:{key}") for key, spec in BOARD_SOURCES.items()]
+        scraper.BOARD_SOURCES = {
+            key: dict(spec, list_url=srv.url(f"/board/{key}/") + "{page}") for key, spec in BOARD_SOURCES.items()
+        }
+        try:
+            yield srv, feeds
+        finally:
+            scraper.RSS_SOURCES, scraper.BOARD_SOURCES = saved
+
+def bench_collect(args, tmp):
+    out = []
+    configure_fetch_limits(DEFAULTS["fetch_workers"], DEFAULTS["fetch_workers"])
+    with local_sources(args.seed) as (srv, feeds):
+        def collect(cache=None):
+            return scraper.collect_rss(DEFAULTS["user_agent"], 10, 0, 0.0, gov_pages=1, cache=cache,
+                                       known=set(), gov_max_pages=fixtures.BOARD_PAGES)
+
+        n = len(collect())
+        out.append(measure("collect_rss.cold", lambda _: collect(), n, args.repeat))
+
+        # 조건부 GET: 검증자를 채운 뒤에는 304만 받고 파싱을 건너뜀
+        cache = ValidatorCache(os.path.join(tmp, "validators.json"))
+        collect(cache)
+        out.append(measure("collect_rss.not_modified", lambda _: collect(cache), len(feeds), args.repeat))
+
+    bodies = [body for _, _, body, _ in feeds]
+    n = sum(len(scraper._parse_entries(b)) for b in bodies)
+    out.append(measure("parse_entries", lambda _: [scraper._parse_entries(b) for b in bodies], n, args.repeat))
+    return out
+
+
+# ----------------------------
+# 태그 / SimHash / 근접 중복
+# ----------------------------
+def bench_text(args, tmp):
+    titles = fixtures.synthetic_titles(min(args.rows, 50000), seed=args.seed + 1)
+    n = len(titles)
+    out = [
+        measure("pick_tags", lambda _: [scraper.pick_tags(t) for t in titles], n, args.repeat),
+        measure("pick_tags_batch", lambda _: scraper.pick_tags_batch(titles), n, args.repeat),
+        measure("simhash64", lambda _: [scraper.simhash64(t) for t in titles], n, args.repeat),
+        measure("simhash64_batch", lambda _: scraper.simhash64_batch(titles), n, args.repeat),
+    ]
+
+    rows = fixtures.news_rows(args.rows, seed=args.seed)[1:]
+    stored = [(int(r[7]), r[3]) for r in rows if r[7].isdigit()]
+    queries = [int(s) for s in scraper.simhash64_batch(titles[:5000]) if s.isdigit()]
+    for label, capacity in (("recent", DEFAULTS["recent_sim_n"]), ("full", 0)):
+        idx = SimHashIndex(max_hamming=DEFAULTS["max_hamming"], capacity=capacity)
+        for sim, url in stored:
+            idx.add(sim, url)
+        out.append(measure(
+            f"find_near_duplicate.{label}",
+            lambda _: [scraper.find_near_duplicate(q, idx, DEFAULTS["max_hamming"]) for q in queries],
+            len(queries), args.repeat,
+        ))
+    return out
+
+
+# ----------------------------
+# load_indexes(시트 직접 / 로컬 저장소 / DedupStore)
+# ----------------------------
+def _local_storage(tmp, rows):
+    storage = LocalStorage(os.path.join(tempfile.mkdtemp(dir=tmp), "news.sqlite3"))
+    storage.append_rows(rows[1:])
+    return storage
+
+def bench_indexes(args, tmp):
+    rows = fixtures.news_rows(args.rows, seed=args.seed)
+    ws = SheetStorage(FakeWorksheet(rows))
+    n = len(rows) - 1
+    recent_sim_n = DEFAULTS["recent_sim_n"]
+    out = [measure("load_indexes.sheet", lambda _: scraper.load_indexes(ws, recent_sim_n), n, args.repeat)]
+    local = _local_storage(tmp, rows)
+    out.append(measure("load_indexes.local", lambda _: scraper.load_indexes(local, recent_sim_n), n, args.repeat))
+    out.append(measure("storage.local_append", lambda s: s.append_rows(rows[1:]), n, args.repeat,
+                       setup=lambda: LocalStorage(os.path.join(tempfile.mkdtemp(dir=tmp), "news.sqlite3"))))
+
+    def cold():
+        d = tempfile.mkdtemp(dir=tmp)
+        return DedupStore(os.path.join(d, "dedup.sqlite3")), MetaSession(FakeWorksheet([META_HEADERS], "meta"))
+
+    def run_store(arg):
+        store, meta = arg
+        scraper.load_indexes(ws, recent_sim_n, store=store, meta=meta)
+        store.close()
+
+    out.append(measure("load_indexes.store_cold", run_store, n, args.repeat, setup=cold))
+
+    # 워터마크가 맞는 상태: 마지막 행부터만 읽음
+    warm_path = os.path.join(tmp, "warm.sqlite3")
+    meta = MetaSession(FakeWorksheet([META_HEADERS], "meta"))
+    scraper.load_indexes(ws, recent_sim_n, store=DedupStore(warm_path), meta=meta)
+    out.append(measure("load_indexes.store_warm", run_store, n, args.repeat,
+                       setup=lambda: (DedupStore(warm_path), meta)))
+    return out
+
+
+# ----------------------------
+# news_app 필터/렌더링(news.dashboard + 스냅샷 + 검색 색인)
+# ----------------------------
+def bench_dashboard(args, tmp):
+    from news import dashboard
+    from news.search import NgramIndex
+    from news.snapshot import NewsSnapshot
+
+    rows = fixtures.news_rows(args.rows, seed=args.seed)
+    ws = SheetStorage(FakeWorksheet(rows))
+    local = _local_storage(tmp, rows)
+    n = len(rows) - 1
+
+    def snap_setup():
+        return NewsSnapshot(os.path.join(tempfile.mkdtemp(dir=tmp), "news.parquet"))
+
+    out = [measure("snapshot.full_refresh", lambda s: s.refresh(lambda: ws), n, args.repeat, setup=snap_setup)]
+    out.append(measure("snapshot.full_refresh.local", lambda s: s.refresh(lambda: local), n, args.repeat, setup=snap_setup))
+    snap = snap_setup()
+    df, _ = snap.refresh(lambda: ws)
+
+    order = dashboard.time_order(df)
+    out.append(measure("dashboard.time_order", lambda _: dashboard.time_order(df), n, args.repeat))
+    index = NgramIndex.from_frame(df)
+    out.append(measure("dashboard.search_index_build", lambda _: NgramIndex.from_frame(df), n, args.repeat))
+
+    last = (fixtures.BASE_TIME + timedelta(hours=9)).date()
+    cases = {
+        "7d": (last - timedelta(days=7), last, "전체", ""),
+        "30d": (last - timedelta(days=30), last, "전체", ""),
+        "30d_tag": (last - timedelta(days=30), last, next(iter(KEYWORDS)), ""),
+        "30d_keyword": (last - timedelta(days=30), last, "전체", "전공의 정부"),
+    }
+    for label, (d0, d1, tag, kw) in cases.items():
+        hits = dashboard.filter_positions(df, order, d0, d1, tag, kw, get_index=lambda: index)
+        out.append(measure(
+            f"dashboard.filter.{label}",
+            lambda _: dashboard.filter_positions(df, order, d0, d1, tag, kw, get_index=lambda: index),
+            len(hits), args.repeat,
+        ))
+    hits = dashboard.filter_positions(df, order, *cases["30d"][:2], "전체", "", get_index=lambda: index)
+    page = hits[:100]
+    out.append(measure("dashboard.render_page_100", lambda _: dashboard.render_table(df, page), len(page), args.repeat))
+    return out
+
+
+SUITES = {
+    "collect": bench_collect,
+    "text": bench_text,
+    "indexes": bench_indexes,
+    "dashboard": bench_dashboard,
+}
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+def compare(results, baseline_path: str, threshold: float) -> int:
+    """median 비율(현재/기준) 출력. threshold를 넘는 항목 수 반환."""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        base = {r["name"]: r for r in json.load(f).get("results", [])}
+    worse = 0
+    for r in results:
+        b = base.get(r["name"])
+        if not b or not b["median_ms"]:
+            continue
+        ratio = r["median_ms"] / b["median_ms"]
+        flag = ""
+        if threshold and ratio > threshold:
+            flag = "  <-- regression"
+            worse += 1
+        print(f"{r['name']:<36} {b['median_ms']:>10.2f} → {r['median_ms']:>10.2f} ms  x{ratio:.2f}{flag}", file=sys.stderr)
+    return worse
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m bench.run")
+    ap.add_argument("--rows", type=int, default=10000, help="합성 NEWS 시트 행 수(10k~1M)")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--only", default="", help="쉼표로 구분한 스위트 이름(collect,text,indexes,dashboard)")
+    ap.add_argument("--out", default="", help="결과 JSON 경로(없으면 stdout)")
+    ap.add_argument("--compare", default="", help="비교할 이전 결과 JSON")
+    ap.add_argument("--threshold", type=float, default=0.0, help="median 비율이 이 값을 넘으면 종료 코드 1")
+    ap.add_argument("--record", action="store_true", help="실제 피드/게시판을 fixtures에 녹화하고 종료")
+    args = ap.parse_args(argv)
+
+    if args.record:
+        print(f"recorded {fixtures.record()} fixtures → {fixtures.FIXTURE_DIR}")
+        return 0
+
+    names = [s.strip() for s in args.only.split(",") if s.strip()] or list(SUITES)
+    tmp = tempfile.mkdtemp(prefix="news-bench-")
+    results = []
+    try:
+        for name in names:
+            t0 = time.perf_counter()
+            results.extend(SUITES[name](args, tmp))
+            print(f"[{name}] {time.perf_counter() - t0:.1f}s", file=sys.stderr)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    recorded = sum(r for *_, r in fixtures.feed_bodies(args.seed)) + sum(r for _, r in fixtures.board_bodies(args.seed).values())
+    doc = {
+        "meta": {
+            "commit": _git_commit(),
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "rows": args.rows,
+            "repeat": args.repeat,
+            "seed": args.seed,
+            "recorded_fixtures": recorded,
+        },
+        "results": results,
+    }
+    text = json.dumps(doc, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        return 1 if compare(results, args.compare, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
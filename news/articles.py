@@ -0,0 +1,141 @@
+# hismedi-app/news/articles.py
+# -*- coding: utf-8 -*-
+"""reader.py 본문(article_text) 기록 계층.
+
+행마다 UPDATE DML을 날리는 대신 버퍼에 모았다가 한 번에 씁니다.
+- ArticleWriter: add()로 모으고 batch_size건 또는 flush_interval_sec초마다 flush
+- BigQueryArticleWriter: 스테이징 테이블에 load job(WRITE_TRUNCATE) → MERGE 1회
+- SqliteArticleWriter: 같은 의미의 로컬 대체 구현(오프라인 테스트/단일 서버 실행용)
+"""
+
+import os, time, uuid, sqlite3, threading
+from datetime import datetime, timedelta, timezone
+
+# 스테이징 테이블 만료(적재와 MERGE 사이에 중단돼 close()가 지우지 못해도 자동 삭제)
+STAGING_EXPIRES = timedelta(days=1)
+
+
+class ArticleWriter:
+    def __init__(self, batch_size: int = 200, flush_interval_sec: float = 30.0):
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval_sec = float(flush_interval_sec)
+        self.written = 0
+        self._buf = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def add(self, url: str, content: str):
+        with self._lock:
+            self._buf.append((url, content))
+            full = len(self._buf) >= self.batch_size
+        if full:
+            self.flush()
+        else:
+            self.poll()
+
+    def poll(self):
+        """flush_interval_sec가 지났으면 모인 만큼 기록(새 항목이 없어도 주기적으로 호출)."""
+        if self._buf and time.monotonic() - self._last_flush >= self.flush_interval_sec:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            batch, self._buf = self._buf, []
+            self._last_flush = time.monotonic()
+        if batch:
+            # 실제로 반영된 행 수(_write 반환값)만 셈
+            self.written += self._write(batch)
+
+    def close(self):
+        self.flush()
+
+    def _write(self, batch) -> int:
+        """batch를 기록하고 반영된 행 수를 반환합니다."""
+        raise NotImplementedError
+
+
+class BigQueryArticleWriter(ArticleWriter):
+    """스테이징 테이블(실행별 이름, STAGING_EXPIRES 뒤 만료)에 적재 후 MERGE로 target.article_text 갱신."""
+
+    def __init__(self, client, target_table: str, batch_size: int = 200, flush_interval_sec: float = 30.0):
+        super().__init__(batch_size, flush_interval_sec)
+        from google.cloud import bigquery  # reader 환경에만 있는 의존성
+
+        self._bq = bigquery
+        self.client = client
+        self.target_table = target_table
+        self.staging_table = f"{target_table}_staging_{uuid.uuid4().hex[:12]}"
+        self._staging_ready = False
+
+    def _create_staging(self, schema):
+        # 만료 시각을 가진 빈 테이블을 먼저 만들고 적재(WRITE_TRUNCATE)는 데이터만 교체
+        table = self._bq.Table(self.staging_table, schema=schema)
+        table.expires = datetime.now(timezone.utc) + STAGING_EXPIRES
+        self.client.create_table(table, exists_ok=True)
+        self._staging_ready = True
+
+    def _write(self, batch):
+        bigquery = self._bq
+        schema = [
+            bigquery.SchemaField("url", "STRING"),
+            bigquery.SchemaField("content", "STRING"),
+        ]
+        if not self._staging_ready:
+            self._create_staging(schema)
+        job_config = bigquery.LoadJobConfig(
+            schema=schema,
+            write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE,
+        )
+        rows = [{"url": url, "content": content} for url, content in batch]
+        self.client.load_table_from_json(rows, self.staging_table, job_config=job_config).result()
+        merge_sql = f"""
+        MERGE `{self.target_table}` t
+        USING (SELECT url, ANY_VALUE(content) AS content FROM `{self.staging_table}` GROUP BY url) s
+        ON t.url = s.url
+        WHEN MATCHED THEN UPDATE SET article_text = s.content
+        """
+        job = self.client.query(merge_sql)
+        job.result()
+        return int(job.num_dml_affected_rows or 0)
+
+    def close(self):
+        try:
+            super().close()
+        finally:
+            self.client.delete_table(self.staging_table, not_found_ok=True)
+
+
+class SqliteArticleWriter(ArticleWriter):
+    """BigQuery 대신 로컬 SQLite 테이블(url, article_text 열 포함)에 기록.
+    url이 없는 행은 새로 넣는 upsert(READER_WRITER=sqlite로 BigQuery 행을 빈 로컬 테이블에 쓰는 경우 포함).
+    """
+
+    def __init__(self, path: str, target_table: str = "raw_stream_native", batch_size: int = 200, flush_interval_sec: float = 30.0):
+        super().__init__(batch_size, flush_interval_sec)
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        self.target_table = target_table
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(f"CREATE TABLE IF NOT EXISTS {target_table} (url TEXT PRIMARY KEY, article_text TEXT)")
+        # 예전에 키 없이 만든 테이블도 ON CONFLICT(url)가 동작하도록
+        self.conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS idx_{target_table}_url ON {target_table}(url)")
+        self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS article_staging (url TEXT PRIMARY KEY, content TEXT)")
+
+    def _write(self, batch) -> int:
+        with self.conn:
+            self.conn.execute("DELETE FROM article_staging")
+            self.conn.executemany("INSERT OR REPLACE INTO article_staging(url, content) VALUES (?, ?)", batch)
+            before = self.conn.total_changes
+            self.conn.execute(f"""
+                INSERT INTO {self.target_table}(url, article_text)
+                SELECT url, content FROM article_staging WHERE true
+                ON CONFLICT(url) DO UPDATE SET article_text = excluded.article_text
+            """)
+            return self.conn.total_changes - before
+
+    def close(self):
+        try:
+            super().close()
+        finally:
+            self.conn.close()
@@ -0,0 +1,95 @@
+# hismedi-app/news/boards.py
+# -*- coding: utf-8 -*-
+"""정부/기관 게시판 목록 크롤러 엔진(config.BOARD_SOURCES 선언형 스펙 기반).
+
+- lxml로 파싱, 행/링크/날짜는 스펙의 XPath로 추출
+- 페이지는 window개씩 병렬로 받고, 순서대로 처리하다가
+  min_pages 이후 '항목이 있고 전부 이미 저장된 페이지'나 빈 목록을 만나면 중단
+  (평상시에는 1페이지로 끝나고, 장애 후에는 max_pages까지 자동으로 거슬러 올라감)
+- min_pages 이후 페이지 요청이 실패하면 거기서 멈추고 그때까지 모은 항목을 반환
+"""
+
+import re
+from datetime import datetime, timezone
+from urllib.parse import urljoin
+
+import lxml.html
+
+
+def _parse_date_any(s: str) -> str:
+    """YYYY.MM.DD / YYYY-MM-DD 형태를 UTC ISO로 변환(실패 시 '')."""
+    s = (s or "").strip().replace(".", "-")
+    m = re.search(r"(\d{4}-\d{2}-\d{2})", s)
+    if not m:
+        return ""
+    try:
+        dt = datetime.strptime(m.group(1), "%Y-%m-%d").replace(tzinfo=timezone.utc)
+        return dt.isoformat()
+    except Exception:
+        return ""
+
+def _text(el) -> str:
+    # BeautifulSoup get_text(" ", strip=True)와 같은 규칙
+    return " ".join(t.strip() for t in el.itertext() if t.strip())
+
+def parse_board_page(html: str, spec: dict):
+    """목록 페이지 한 장에서 (title, link, published_at) 목록."""
+    if not (html or "").strip():
+        return []
+    doc = lxml.html.fromstring(html)
+    out = []
+    for tr in doc.xpath(spec["row_xpath"]):
+        links = tr.xpath(spec["link_xpath"])
+        if not links:
+            continue
+        a = links[0]
+        link = urljoin(spec["base_url"], (a.get("href") or "").strip())
+        published_at = ""
+        for cell in tr.xpath(spec.get("date_xpath", ".//td")):
+            published_at = _parse_date_any(_text(cell))
+            if published_at:
+                break
+        out.append((_text(a), link, published_at))
+    return out
+
+def _known_flags(known, urls):
+    if known is None:
+        return [False] * len(urls)
+    if hasattr(known, "contains_many"):
+        return list(known.contains_many(urls))
+    return [u in known for u in urls]
+
+def crawl_board(spec: dict, fetch_pages, emit, min_pages: int = 1, max_pages: int = 1, known=None, window: int = 2):
+    """spec 게시판을 크롤링해 emit(title, link, published_at)이 돌려준 항목 목록을 반환합니다.
+    - fetch_pages(urls) → 응답 리스트(입력 순서, 실패한 페이지는 예외 객체)
+    - known: 이미 저장된 url_canonical 집합(set / FingerprintSet / StoreKeySet). None이면 조기 중단 없이 min_pages만
+    - emit이 None을 돌려준 행(태그 없음 등)은 판단에서 제외(태그된 항목이 없는 페이지로는 중단하지 않음)
+    - min_pages까지의 실패는 그대로 예외(소스 실패), 그 뒤의 실패는 페이지 넘김만 중단
+    """
+    min_pages = max(1, int(min_pages))
+    max_pages = max(min_pages, int(max_pages)) if known is not None else min_pages
+    window = max(1, int(window))
+
+    out = []
+    page = 1
+    while page <= max_pages:
+        # 최소 페이지 수까지는 한 번에, 그 뒤로는 window개씩
+        last = min_pages if page <= min_pages else min(max_pages, page + window - 1)
+        urls = [spec["list_url"].format(page=p) for p in range(page, last + 1)]
+        for p, r in zip(range(page, last + 1), fetch_pages(urls)):
+            if isinstance(r, Exception):
+                if p <= min_pages:
+                    raise r
+                print(f"board paging stopped: {spec['source']}: page {p}: {type(r).__name__}: {r}")
+                return out
+            rows = parse_board_page(r.text, spec)
+            if not rows:
+                return out
+            items = [it for it in (emit(*row) for row in rows) if it]
+            flags = _known_flags(known, [it["url_canonical"] for it in items])
+            new_items = [it for it, k in zip(items, flags) if not k]
+            out.extend(items)
+            if p >= min_pages and items and not new_items:
+                return out
+        page = last + 1
+    return out
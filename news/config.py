@@ -59,19 +59,74 @@ RSS_SOURCES = [
     ("라포르시안(G)", "https://news.google.com/rss/search?q=source:라포르시안+when:7d&hl=ko&gl=KR&ceid=KR:ko"), 
 ]
 
+# ----------------------------
+# 정부 게시판(HTML 목록) 크롤링 스펙
+# - RSS_SOURCES에 ("이름", "HTML:<키>")로 넣으면 사용
+# - list_url의 {page}에 페이지 번호, XPath는 행/링크/날짜 셀
+# ----------------------------
+BOARD_SOURCES = {
+    "mohw": {
+        "source": "보건복지부-보도자료",
+        "list_url": "https://www.mohw.go.kr/board.es?mid=a10503010100&bid=0027&nPage={page}",
+        "base_url": "https://www.mohw.go.kr/",
+        "row_xpath": "//table//tbody//tr",
+        "link_xpath": ".//a[@href]",
+        "date_xpath": ".//td",
+    },
+    "moel": {
+        "source": "고용노동부-보도자료",
+        "list_url": "https://www.moel.go.kr/news/enews/report/enewsList.do?pageIndex={page}",
+        "base_url": "https://www.moel.go.kr/",
+        "row_xpath": "//table//tbody//tr",
+        "link_xpath": ".//a[@href][contains(@href, 'enewsView.do')]",
+        "date_xpath": ".//td",
+    },
+}
+
 # ----------------------------
 # 기본 설정
 # ----------------------------
 DEFAULTS = {
     "max_hamming": 6,
+    # SimHash 근접 중복 검사 창(최근 N건, 0이면 전체 이력; 다중 블록 인덱스라 크게 잡아도 됨)
     "recent_sim_n": 800,
     "fetch_timeout_sec": 10,
     # HTML 크롤링 페이지 수(1페이지=최신 약 10~20건)
     "gov_pages": 1,
+    # 게시판 최대 페이지 수(새 항목이 없는 페이지에서 멈추므로 평상시에는 1페이지로 끝남)
+    "gov_max_pages": 10,
     "rss_enabled": True,
     # 일부 환경에서 RSS가 403/리다이렉트 나는 것을 줄이기 위해 UA는 꼭 씁니다.
     "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120 Safari/537.36 (compatible; NewsSheetBot/1.0)",
     # requests 재시도/백오프(스크래퍼에서 사용)
     "http_retries": 2,
     "http_backoff_sec": 1.2,
+    # 동시 수집: 전역 동시 요청 상한 / 같은 호스트 동시 요청 상한
+    "fetch_workers": 8,
+    "per_host_limit": 2,
+    # 서킷 브레이커: 연속 N회 실행 실패한 호스트는 건너뛰고, M회 실행마다 한 번 재시도
+    "breaker_threshold": 3,
+    "breaker_probe_every": 6,
+    # Google News 링크를 원문 URL로 해석해 url_canonical에 저장(실패는 N일 뒤 재시도)
+    "resolve_redirects": True,
+    "redirect_retry_days": 3,
+    # 로컬 캐시(조건부 GET 검증자 등) 저장 위치
+    "cache_dir": ".news_cache",
+    # 스크레이퍼 묶음 저장(news.storage.BatchSink): N행이 모이거나 첫 행 이후 T초가 지나면 append_rows 1회
+    "sink_batch_rows": 100,
+    "sink_batch_sec": 30,
+    # 상주 모드(news.daemon): 소스별 폴링 간격 범위 / 폴링 1회에 기대하는 새 항목 수 / 간격 지터(±비율)
+    "daemon_min_interval_sec": 300,
+    "daemon_max_interval_sec": 6 * 3600,
+    "daemon_target_new_per_poll": 3,
+    "daemon_jitter": 0.2,
+    # 전체 폴링 예산(시간당 요청 수, 0 = 제한 없음) — 넘으면 모든 소스 간격을 같은 비율로 늘림
+    # 비어 있으면 cron 실행과 같은 양: 소스 수 / daemon_cron_hours(scrape.yml의 4시간 주기)
+    "daemon_polls_per_hour": "",
+    "daemon_cron_hours": 4,
+    # 새 행 묶음 저장: N행이 모이거나 첫 행 이후 T초가 지나면 append_rows 1회
+    "daemon_batch_rows": 20,
+    "daemon_batch_sec": 120,
+    # 저장소 인덱스 재동기화(다른 실행/수동 편집 반영) 및 캐시 저장 주기
+    "daemon_resync_sec": 3600,
 }
@@ -0,0 +1,256 @@
+# hismedi-app/news/contentcache.py
+# -*- coding: utf-8 -*-
+"""reader.py 원문 HTML / 추출 본문 로컬 캐시(URL 해시 기반) + 실패(네거티브) 캐시.
+
+- 파일 경로: <root>/<sha256 앞 2자리>/<sha256>.html|.txt + 압축 확장자
+  (zstandard가 설치되어 있으면 .zst, 없으면 .gz — 읽을 때는 둘 다 지원)
+- 추출 설정을 바꾼 뒤에도 HTML을 다시 받지 않고 재추출할 수 있습니다.
+- close()에서 max_age_days보다 오래 쓰이지 않은 파일을 지우고, 그래도 max_bytes를 넘으면
+  오래된 것부터 지웁니다(읽을 때 수정 시각을 갱신하므로 다시 쓰인 항목은 남음).
+- 실패한 URL은 attempts 횟수에 따라 base_hours * 2^(n-1) 시간 동안 건너뛰고,
+  max_attempts회 실패하면 '죽은 URL'로 보고 더 이상 시도하지 않습니다.
+  죽은 URL은 dead_ttl_days가 지나면 파일에서 지우고(save), BigQuery 경로에서는
+  reader가 별도 테이블로 옮긴 뒤 forget()으로 지웁니다(파일과 쿼리 파라미터가 계속 커지지 않도록).
+"""
+
+import os, time, gzip, json, hashlib, threading
+from datetime import datetime, timedelta, timezone
+
+try:
+    import zstandard
+except ImportError:  # 선택 의존성
+    zstandard = None
+
+
+def url_key(url: str) -> str:
+    return hashlib.sha256((url or "").encode("utf-8")).hexdigest()
+
+def _compress(data: bytes):
+    if zstandard is not None:
+        return ".zst", zstandard.ZstdCompressor(level=6).compress(data)
+    return ".gz", gzip.compress(data, compresslevel=6)
+
+def _decompress(ext: str, data: bytes) -> bytes:
+    if ext == ".zst":
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    return gzip.decompress(data)
+
+
+_SUFFIX = {"html": "html", "text": "txt"}
+
+
+class ContentCache:
+    def __init__(self, root: str, max_age_days: float = 0, max_bytes: int = 0):
+        self.root = root
+        self.max_age_days = float(max_age_days)
+        self.max_bytes = int(max_bytes)
+        self._lock = threading.Lock()
+        self.stats = {"html_hit": 0, "text_hit": 0, "html_put": 0, "text_put": 0, "pruned": 0}
+
+    def _path(self, url: str, kind: str) -> str:
+        k = url_key(url)
+        return os.path.join(self.root, k[:2], f"{k}.{_SUFFIX[kind]}")
+
+    def _get(self, url: str, kind: str):
+        base = self._path(url, kind)
+        exts = (".zst", ".gz") if zstandard is not None else (".gz",)
+        for ext in exts:
+            try:
+                with open(base + ext, "rb") as f:
+                    data = _decompress(ext, f.read())
+            except (OSError, EOFError, ValueError):
+                continue
+            try:
+                os.utime(base + ext)
+            except OSError:
+                pass
+            self._incr(f"{kind}_hit")
+            return data
+        return None
+
+    def _put(self, url: str, kind: str, data: bytes):
+        base = self._path(url, kind)
+        os.makedirs(os.path.dirname(base), exist_ok=True)
+        ext, blob = _compress(data)
+        tmp = f"{base}{ext}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(blob)
+        os.replace(tmp, base + ext)
+        self._incr(f"{kind}_put")
+
+    def _incr(self, key: str, n: int = 1):
+        with self._lock:
+            self.stats[key] += n
+
+    def get_html(self, url: str):
+        return self._get(url, "html")
+
+    def put_html(self, url: str, html: bytes):
+        if html:
+            self._put(url, "html", html)
+
+    def get_text(self, url: str):
+        data = self._get(url, "text")
+        return data.decode("utf-8") if data is not None else None
+
+    def put_text(self, url: str, text: str):
+        if text:
+            self._put(url, "text", text.encode("utf-8"))
+
+    # ----------------------------
+    # 정리
+    # ----------------------------
+    def _files(self):
+        # <root>/<sha256 앞 2자리>/ 아래 캐시 파일만(root의 failures.json 등은 제외)
+        try:
+            shards = [d for d in os.listdir(self.root) if len(d) == 2 and os.path.isdir(os.path.join(self.root, d))]
+        except OSError:
+            return []
+        out = []
+        for shard in shards:
+            d = os.path.join(self.root, shard)
+            for name in os.listdir(d):
+                p = os.path.join(d, name)
+                try:
+                    st = os.stat(p)
+                except OSError:
+                    continue
+                out.append((st.st_mtime, st.st_size, p))
+        return out
+
+    def prune(self, max_age_days: float = 0, max_bytes: int = 0, now: float = 0) -> int:
+        """오래된(max_age_days) 파일과 남은 임시 파일을 지우고, 합계가 max_bytes를 넘으면 오래된 것부터 지움.
+        0이면 해당 기준은 쓰지 않습니다. 지운 파일 수를 반환합니다."""
+        now = now or time.time()
+        cutoff = now - max_age_days * 86400 if max_age_days > 0 else None
+        keep, drop = [], []
+        for ent in self._files():
+            mtime, _, p = ent
+            stale_tmp = p.endswith(".tmp") and mtime < now - 3600  # 중단된 쓰기
+            if stale_tmp or (cutoff is not None and mtime < cutoff):
+                drop.append(ent)
+            else:
+                keep.append(ent)
+        if max_bytes > 0:
+            keep.sort()
+            total = sum(size for _, size, _ in keep)
+            while keep and total > max_bytes:
+                ent = keep.pop(0)
+                total -= ent[1]
+                drop.append(ent)
+        removed = 0
+        for _, _, p in drop:
+            try:
+                os.remove(p)
+                removed += 1
+            except OSError:
+                pass
+        self._incr("pruned", removed)
+        return removed
+
+    def close(self):
+        if self.max_age_days > 0 or self.max_bytes > 0:
+            self.prune(self.max_age_days, self.max_bytes)
+
+
+class FailureCache:
+    """URL별 실패 횟수/다음 시도 시각(JSON). 성공하면 기록을 지웁니다."""
+
+    def __init__(self, path: str, base_hours: float = 6.0, max_hours: float = 24.0 * 14, max_attempts: int = 6,
+                 dead_ttl_days: float = 0):
+        self.path = path
+        self.base_hours = float(base_hours)
+        self.max_hours = float(max_hours)
+        self.max_attempts = int(max_attempts)
+        self.dead_ttl_days = float(dead_ttl_days)
+        self._lock = threading.Lock()
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self._entries = json.load(f) or {}
+        except (OSError, ValueError):
+            self._entries = {}
+
+    def is_dead(self, url: str) -> bool:
+        with self._lock:
+            ent = self._entries.get(url)
+        return bool(ent) and ent.get("attempts", 0) >= self.max_attempts
+
+    def should_skip(self, url: str, now=None) -> bool:
+        """죽은 URL이거나 백오프 시간 안이면 True."""
+        with self._lock:
+            ent = self._entries.get(url)
+        if not ent:
+            return False
+        if ent.get("attempts", 0) >= self.max_attempts:
+            return True
+        now = now or datetime.now(timezone.utc)
+        return now < datetime.fromisoformat(ent["next_at"])
+
+    def skip_urls(self, now=None) -> list:
+        now = now or datetime.now(timezone.utc)
+        with self._lock:
+            urls = list(self._entries)
+        return [u for u in urls if self.should_skip(u, now)]
+
+    def record_failure(self, url: str, error: str = ""):
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            ent = self._entries.get(url) or {"attempts": 0}
+            n = ent["attempts"] + 1
+            wait = min(self.max_hours, self.base_hours * (2 ** (n - 1)))
+            self._entries[url] = {
+                "attempts": n,
+                "next_at": (now + timedelta(hours=wait)).isoformat(),
+                "error": str(error)[:200],
+            }
+            if n >= self.max_attempts:
+                self._entries[url]["dead_at"] = now.isoformat()
+
+    def record_success(self, url: str):
+        with self._lock:
+            self._entries.pop(url, None)
+
+    def dead_urls(self) -> list:
+        with self._lock:
+            return [u for u, e in self._entries.items() if e.get("attempts", 0) >= self.max_attempts]
+
+    def forget(self, urls):
+        """기록 삭제(다른 곳 — 예: BigQuery 테이블 — 으로 옮긴 죽은 URL)."""
+        with self._lock:
+            for u in urls:
+                self._entries.pop(u, None)
+
+    def prune(self, now=None) -> int:
+        """dead_ttl_days보다 오래된 죽은 URL 기록을 지웁니다(dead_at이 없는 예전 기록은 지금 시각으로 채움)."""
+        if self.dead_ttl_days <= 0:
+            return 0
+        now = now or datetime.now(timezone.utc)
+        cutoff = now - timedelta(days=self.dead_ttl_days)
+        with self._lock:
+            drop = []
+            for u, e in self._entries.items():
+                if e.get("attempts", 0) < self.max_attempts:
+                    continue
+                e.setdefault("dead_at", now.isoformat())
+                if datetime.fromisoformat(e["dead_at"]) < cutoff:
+                    drop.append(u)
+            for u in drop:
+                del self._entries[u]
+        return len(drop)
+
+    def summary(self) -> dict:
+        with self._lock:
+            ents = list(self._entries.values())
+        dead = sum(1 for e in ents if e.get("attempts", 0) >= self.max_attempts)
+        return {"tracked": len(ents), "dead": dead}
+
+    def save(self):
+        self.prune()
+        d = os.path.dirname(self.path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        tmp = self.path + ".tmp"
+        with self._lock:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
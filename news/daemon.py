@@ -0,0 +1,337 @@
+# hismedi-app/news/daemon.py
+# -*- coding: utf-8 -*-
+"""상주 수집 모드(python -m news.daemon).
+
+cron으로 매번 새 프로세스(import / 인증 / 인덱스 읽기)를 띄우는 대신 한 프로세스에서
+- 저장소, 중복 제거 인덱스, HTTP 연결 풀, 조건부 GET / 리다이렉트 캐시를 계속 유지하고
+- 소스마다 관측한 (태그된) 항목의 발행 시각으로 발행 속도를 학습해 폴링 간격을 따로 정하며(지터 포함)
+- 새 행은 daemon_batch_rows건 또는 daemon_batch_sec초마다 append_rows 1회로 묶어 저장합니다(BatchSink).
+전체 폴링 수는 daemon_polls_per_hour 예산(기본: cron 실행과 같은 소스 수 / 4시간) 안에서 발행이 잦은 소스에 몰아 줍니다.
+학습 상태(소스별 발행 시각 / 다음 폴링 시각)는 <캐시 폴더>/daemon_state.json에 남아 재시작 후에도 이어지고,
+daemon_resync_sec마다 인덱스 재동기화 + 계측(runs.jsonl / METRICS) 기록 + 캐시 저장을 하고,
+META를 다시 읽어 설정 변경을 반영합니다(rss_enabled=FALSE이면 다시 켤 때까지 폴링하지 않음).
+"""
+
+import os, json, time, random, signal, argparse, threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from news.config import DEFAULTS
+from news.httpcache import ValidatorCache
+from news.metrics import RunMetrics
+from news.redirects import RedirectCache
+from news.state import DedupStore
+from news.storage import open_storage, BatchSink
+from news.transport import configure_fetch_limits, CircuitBreaker
+from news.scraper import (
+    cache_dir, load_settings, load_indexes, unique_sources, dedup_items, resolve_stream, _collect_source,
+)
+
+# 발행 속도 추정에 쓰는 소스별 최근 발행 시각 수
+RATE_WINDOW = 30
+
+
+def cron_polls_per_hour(n_sources: int) -> float:
+    """cron 실행(daemon_cron_hours마다 모든 소스 1회)과 같은 시간당 요청 수."""
+    return n_sources / max(float(DEFAULTS["daemon_cron_hours"]), 1e-9)
+
+
+def _stamps(items):
+    out = []
+    for it in items:
+        try:
+            out.append(datetime.fromisoformat(it.get("published_at") or "").timestamp())
+        except ValueError:
+            continue
+    return out
+
+
+# ----------------------------
+# 소스별 발행 속도 / 폴링 일정
+# ----------------------------
+class SourceRate:
+    """소스 하나의 최근 발행 시각(epoch 초) → 시간당 발행 수 → 다음 폴링 간격."""
+
+    def __init__(self, stamps=(), idle: int = 0):
+        self.stamps = sorted(stamps)[-RATE_WINDOW:]
+        self.idle = int(idle)  # 새 항목 없이 끝난 연속 폴링 수
+
+    def observe(self, stamps, new_count: int):
+        self.stamps = sorted(set(self.stamps) | set(stamps))[-RATE_WINDOW:]
+        self.idle = 0 if new_count else self.idle + 1
+
+    def per_hour(self, now: float) -> float:
+        """창 안의 발행 수 / (가장 오래된 발행 ~ 지금). 조용해진 소스는 시간이 지날수록 낮아짐."""
+        past = [t for t in self.stamps if t <= now]
+        if len(past) < 2:
+            return 0.0
+        return len(past) * 3600.0 / max(now - past[0], 3600.0)
+
+    def interval(self, now: float, min_sec: float, max_sec: float, target_new: float) -> float:
+        rate = self.per_hour(now)
+        sec = target_new * 3600.0 / rate if rate > 0 else max_sec
+        # 새 항목 없는 폴링이 이어지면 1.5배씩 늘림
+        sec *= 1.5 ** min(self.idle, 10)
+        return min(max_sec, max(min_sec, sec))
+
+
+class PollScheduler:
+    """소스별 다음 폴링 시각(epoch 초). 간격 = SourceRate.interval × (예산 초과 시 공통 배율) × 지터."""
+
+    def __init__(self, names, path: str = "", min_sec: float = 0, max_sec: float = 0, target_new: float = 0,
+                 jitter: float = -1, polls_per_hour: float = -1, rng=None):
+        self.path = path
+        self.rng = rng or random.Random()
+        self.n_sources = len(names)
+        self.configure(min_sec, max_sec, target_new, jitter, polls_per_hour)
+
+        state = {}
+        if path:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    state = json.load(f) or {}
+            except (OSError, ValueError):
+                state = {}
+        now = time.time()
+        self.rates, self.due = {}, {}
+        for name in names:
+            st = state.get(name) or {}
+            self.rates[name] = SourceRate(st.get("stamps", ()), st.get("idle", 0))
+            # 처음 보는 소스는 시작 직후 1분 안에 흩어서 첫 폴링
+            self.due[name] = float(st.get("due") or now + self.rng.uniform(0, min(60.0, self.min_sec)))
+
+    def configure(self, min_sec: float = 0, max_sec: float = 0, target_new: float = 0, jitter: float = -1,
+                  polls_per_hour: float = -1):
+        """간격 범위 / 목표 새 항목 수 / 지터 / 예산 설정(0 또는 음수는 DEFAULTS). 다음 예약부터 적용."""
+        self.min_sec = float(min_sec or DEFAULTS["daemon_min_interval_sec"])
+        self.max_sec = max(self.min_sec, float(max_sec or DEFAULTS["daemon_max_interval_sec"]))
+        self.target_new = float(target_new or DEFAULTS["daemon_target_new_per_poll"])
+        self.jitter = min(0.9, float(DEFAULTS["daemon_jitter"] if jitter < 0 else jitter))
+        budget = DEFAULTS["daemon_polls_per_hour"] if polls_per_hour < 0 else polls_per_hour
+        self.polls_per_hour = cron_polls_per_hour(self.n_sources) if budget == "" else float(budget)
+
+    def intervals(self, now: float) -> dict:
+        base = {n: r.interval(now, self.min_sec, self.max_sec, self.target_new) for n, r in self.rates.items()}
+        load = sum(3600.0 / v for v in base.values())
+        if self.polls_per_hour > 0 and load > self.polls_per_hour:
+            scale = load / self.polls_per_hour
+            base = {n: v * scale for n, v in base.items()}
+        return base
+
+    def due_now(self, now: float):
+        return [n for n, t in self.due.items() if t <= now]
+
+    def next_due(self) -> float:
+        return min(self.due.values(), default=time.time() + self.max_sec)
+
+    def observe(self, name: str, stamps, new_count: int, now: float) -> float:
+        """폴링 결과 반영 후 다음 폴링 예약. 지터 적용 전 간격(초)을 반환."""
+        self.rates[name].observe(stamps, new_count)
+        sec = self.intervals(now)[name]
+        self.due[name] = now + sec * self.rng.uniform(1 - self.jitter, 1 + self.jitter)
+        return sec
+
+    def save(self):
+        if not self.path:
+            return
+        d = os.path.dirname(self.path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        state = {n: {"stamps": r.stamps, "idle": r.idle, "due": self.due[n]} for n, r in self.rates.items()}
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+
+# ----------------------------
+# 상주 수집기
+# ----------------------------
+class ScrapeDaemon:
+    def __init__(self, storage, scheduler=None):
+        self.storage = storage
+        root = cache_dir()
+        self.store = DedupStore(os.path.join(root, "dedup.sqlite3"))
+        self.http_cache = ValidatorCache(os.path.join(root, "http_validators.json"))
+        self.breaker = CircuitBreaker(os.path.join(root, "circuit.json"))
+        self.redirects = RedirectCache(os.path.join(root, "redirects.json")) if DEFAULTS["resolve_redirects"] else None
+        self.sources = dict(unique_sources())  # 소스 이름 → 피드 URL / HTML: 토큰
+        # 주입한 scheduler(테스트 등)는 META 설정으로 덮어쓰지 않음
+        self._own_scheduler = scheduler is None
+        self.scheduler = scheduler or PollScheduler(list(self.sources), os.path.join(root, "daemon_state.json"))
+        self.metrics = RunMetrics()
+        self.sink = BatchSink(storage, on_flush=self._on_flush, metrics=self.metrics)
+        self._apply_settings()
+        self._load_indexes()
+
+    def _apply_settings(self):
+        """META 설정(없으면 DEFAULTS)을 수집 / 일정 / 묶음 저장에 반영. 시작 시와 재동기화 때마다 호출."""
+        storage = self.storage
+        self.cfg = cfg = load_settings(storage)
+        configure_fetch_limits(cfg["fetch_workers"], cfg["per_host_limit"])
+        meta_num = lambda key: float(storage.get_meta(key) or DEFAULTS[key])
+        if self._own_scheduler:
+            self.scheduler.configure(
+                min_sec=meta_num("daemon_min_interval_sec"), max_sec=meta_num("daemon_max_interval_sec"),
+                target_new=meta_num("daemon_target_new_per_poll"), jitter=meta_num("daemon_jitter"),
+                polls_per_hour=float(storage.get_meta("daemon_polls_per_hour") or -1),
+            )
+        self.resync_sec = meta_num("daemon_resync_sec")
+        self.sink.batch_rows = max(1, int(meta_num("daemon_batch_rows")))
+        self.sink.batch_sec = meta_num("daemon_batch_sec")
+        enabled = cfg["rss_enabled"]
+        if enabled != getattr(self, "enabled", True):
+            print("rss_enabled=TRUE: 폴링 재개" if enabled else "rss_enabled=FALSE: 폴링 중지")
+        self.enabled = enabled
+
+    def _load_indexes(self):
+        with self.metrics.stage("load_indexes"):
+            self.url_set, self.titlehash_set, self.recent_sim = load_indexes(
+                self.storage, self.cfg["recent_sim_n"], self.cfg["max_hamming"], store=self.store, meta=self.storage)
+        self._synced_at = time.monotonic()
+
+    # ----------------------------
+    # 수집
+    # ----------------------------
+    def _collect(self, name: str):
+        c = self.cfg
+        return _collect_source(name, self.sources[name], c["ua"], c["fetch_timeout_sec"], c["retries"], c["backoff"],
+                               c["gov_pages"], cache=self.http_cache, breaker=self.breaker, known=self.url_set,
+                               gov_max_pages=c["gov_max_pages"], metrics=self.metrics)
+
+    def poll(self, names):
+        """names 소스를 동시에 수집 → 원문 URL 해석 → 중복 제거 → BatchSink, 소스별 다음 폴링을 예약."""
+        if not names:
+            return 0
+        c = self.cfg
+        with self.metrics.stage("collect"):
+            with ThreadPoolExecutor(max_workers=max(1, min(len(names), c["fetch_workers"]))) as ex:
+                results = list(ex.map(self._collect, names))
+        now = time.time()
+        added = 0
+        for name, items in zip(names, results):
+            stream = items
+            if self.redirects is not None:
+                stream = resolve_stream(stream, self.redirects, self.titlehash_set, c["ua"], c["fetch_timeout_sec"],
+                                        c["retries"], c["backoff"], breaker=self.breaker, metrics=self.metrics)
+            new = 0
+            for row in dedup_items(stream, self.url_set, self.titlehash_set, self.recent_sim, c["max_hamming"], self.metrics):
+                self._add(row)
+                new += 1
+            added += new
+            sec = self.scheduler.observe(name, _stamps(items), new, now)
+            print(f"poll {name}: {len(items)} items, {new} new, next ~{sec / 60:.0f}m")
+        return added
+
+    # ----------------------------
+    # 저장
+    # ----------------------------
+    def _on_flush(self, rows):
+        self.store.append(rows)
+        self.store.save_watermark(self.storage)
+        self.storage.set_meta("last_inserted_count", str(len(rows)))
+        self.storage.set_meta("last_run_at", datetime.now(timezone.utc).isoformat())
+        self.storage.flush()
+
+    def _add(self, row):
+        try:
+            self.sink.add(row)
+        except Exception as e:
+            # 행은 BatchSink 버퍼에 남아 다음 flush에서 다시 시도
+            print(f"flush failed({len(self.sink.pending)} rows kept): {type(e).__name__}: {e}")
+
+    def flush(self) -> int:
+        """대기 행 저장. 실패하면 행을 남겨 두고 0을 반환(다음 flush에서 다시 시도)."""
+        try:
+            return self.sink.flush()
+        except Exception as e:
+            print(f"flush failed({len(self.sink.pending)} rows kept): {type(e).__name__}: {e}")
+            return 0
+
+    def _checkpoint(self, resync: bool = True):
+        """재동기화 주기: 캐시/학습 상태 저장 + 계측 기록 (+ 인덱스 재동기화, 서킷 브레이커 새 실행).
+        flush가 실패해 남은 행이 있으면 그 소스의 검증자는 저장하지 않음(재시작 후 304로 행을 잃지 않도록).
+        """
+        self.flush()
+        unsaved = {row[1] for row in self.sink.pending}
+        self.http_cache.save(exclude=[url for name, url in self.sources.items() if name in unsaved])
+        self.breaker.save()
+        self.breaker.new_run()
+        if self.redirects is not None:
+            self.redirects.save()
+        self.scheduler.save()
+        self.metrics.set("inserted", self.sink.written)
+        self.metrics.write_jsonl(os.path.join(cache_dir(), "runs.jsonl"))
+        try:
+            self.storage.append_metrics(self.metrics.sheet_rows())
+        except Exception as e:
+            print(f"metrics write failed: {type(e).__name__}: {e}")
+        self.metrics = self.sink.metrics = RunMetrics()
+        self.sink.written = 0
+        if resync:
+            # 설정 변경(rss_enabled 포함) 반영 후 인덱스 재동기화
+            self.storage.reload_meta()
+            self._apply_settings()
+            self._load_indexes()
+
+    def _sleep_sec(self) -> float:
+        now = time.time()
+        waits = [self.resync_sec - (time.monotonic() - self._synced_at)]
+        if self.enabled:
+            waits.append(self.scheduler.next_due() - now)
+        if self.sink.pending:
+            waits.append(self.sink.seconds_left())
+        return max(1.0, min(waits))
+
+    def run(self, stop=None):
+        """stop(threading.Event)이 설정될 때까지 폴링. 종료 시 대기 행 저장."""
+        stop = stop or threading.Event()
+        try:
+            while not stop.is_set():
+                if self.enabled:
+                    self.poll(self.scheduler.due_now(time.time()))
+                if self.sink.due():
+                    self.flush()
+                if time.monotonic() - self._synced_at >= self.resync_sec:
+                    self._checkpoint()
+                stop.wait(self._sleep_sec())
+        finally:
+            self.close()
+
+    def run_once(self):
+        """모든 소스를 한 번 수집·저장(학습 상태 갱신 포함)하고 종료."""
+        try:
+            self.poll(list(self.sources))
+        finally:
+            self.close()
+
+    def close(self):
+        try:
+            self._checkpoint(resync=False)
+        finally:
+            self.store.close()
+            self.storage.close()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="상주 수집 모드(소스별 적응형 폴링 + 묶음 저장)")
+    ap.add_argument("--once", action="store_true", help="모든 소스를 한 번 수집·저장하고 종료")
+    args = ap.parse_args(argv)
+
+    storage = open_storage()
+    if not load_settings(storage)["rss_enabled"]:
+        print("rss_enabled=FALSE: 수집하지 않음")
+        storage.close()
+        return
+    daemon = ScrapeDaemon(storage)
+    if args.once:
+        daemon.run_once()
+        return
+    stop = threading.Event()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, lambda *_: stop.set())
+    daemon.run(stop)
+
+
+if __name__ == "__main__":
+    main()
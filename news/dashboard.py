@@ -0,0 +1,91 @@
+# hismedi-app/news/dashboard.py
+# -*- coding: utf-8 -*-
+"""news_app 필터/표 렌더링 순수 함수(Streamlit 없이 호출 가능 — 캐시는 news_app 쪽에서).
+
+- time_order: 발행 시각 최신순 행 위치(NaT 제외) → 날짜 범위는 searchsorted 두 번
+- filter_positions: 날짜 / 태그 / 키워드(NgramIndex) 조건을 만족하는 행 위치(최신순)
+- render_table: 행 위치 목록을 열 단위 문자열 연산으로 HTML 표로 변환(HTML 이스케이프 포함)
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+from news.snapshot import PUB_KST
+
+
+def as_text(series: pd.Series) -> pd.Series:
+    """(category 포함) 열의 문자열 보기, 빈 값은 ''."""
+    return series.astype(object).fillna("").astype(str)
+
+def escape(series: pd.Series) -> pd.Series:
+    """열 단위 HTML 이스케이프(html.escape(quote=True)와 같은 규칙)."""
+    return (
+        as_text(series)
+        .str.replace("&", "&amp;", regex=False)
+        .str.replace("<", "&lt;", regex=False)
+        .str.replace(">", "&gt;", regex=False)
+        .str.replace('"', "&quot;", regex=False)
+        .str.replace("'", "&#x27;", regex=False)
+    )
+
+
+def time_order(df: pd.DataFrame):
+    """(최신순 행 위치, 그 위치의 -timestamp(int64, 오름차순))."""
+    ts = df[PUB_KST].to_numpy(dtype="datetime64[ns]")
+    valid = np.flatnonzero(~np.isnat(ts))
+    neg = -ts[valid].view("i8")
+    order = np.argsort(neg, kind="stable")
+    return valid[order], neg[order]
+
+def filter_positions(df: pd.DataFrame, order, date_from, date_to, selected_tag: str, kw: str, get_index=None) -> np.ndarray:
+    """필터를 만족하는 행 위치(최신순).
+    - order: time_order(df) 결과
+    - get_index(): 키워드가 있을 때만 호출되는 NgramIndex 공급자
+    """
+    pos, neg = order
+    start = pd.Timestamp(date_from).value
+    end = (pd.Timestamp(date_to) + pd.Timedelta(days=1)).value
+    # start <= ts < end  ⇔  -end < -ts <= -start
+    lo, hi = np.searchsorted(neg, [-end, -start], side="right")
+    pos = pos[lo:hi]
+    if not len(pos):
+        return pos
+
+    mask = np.ones(len(pos), dtype=bool)
+
+    # 태그 필터(단일 선택)
+    if "tags" in df.columns and selected_tag and selected_tag != "전체":
+        mask &= as_text(df["tags"].iloc[pos]).str.contains(re.escape(selected_tag)).to_numpy()
+
+    # 키워드 검색(선택 시): 제목/출처/태그에서 부분일치, 공백으로 나눈 단어는 모두 포함(AND)
+    if kw and get_index is not None:
+        mask &= np.isin(pos, get_index().search(kw))
+
+    return pos[mask]
+
+def render_table(df: pd.DataFrame, positions) -> str:
+    """행 위치 목록 → 뉴스 표 HTML(행 단위 파이썬 루프 없음)."""
+    part = df.iloc[positions]
+
+    url = as_text(part["url_canonical"]) if "url_canonical" in part.columns else as_text(part["url"])
+    if "url" in part.columns:
+        url = url.where(url.str.strip() != "", as_text(part["url"]))
+    pub = part[PUB_KST].dt.strftime("%Y-%m-%d %H:%M")
+    src = escape(part["source"]).str.strip() if "source" in part.columns else pd.Series("", index=part.index)
+    title = escape(part["title"]).str.strip()
+    href = escape(url.str.strip())
+
+    rows = (
+        "<tr><td>" + pub + "</td><td>" + src + "</td>"
+        "<td><a class='newslink' href='" + href + "' target='_blank' rel='noopener noreferrer'>" + title + "</a></td></tr>"
+    )
+    return (
+        "<div style='max-height:760px; overflow:auto; border:1px solid rgba(49,51,63,.14); border-radius:14px;'>"
+        "<table class='news'>"
+        "<thead><tr><th>발행</th><th>출처</th><th>제목</th></tr></thead>"
+        "<tbody>"
+        + "".join(rows.tolist())
+        + "</tbody></table></div>"
+    )
@@ -0,0 +1,163 @@
+# hismedi-app/news/feeds.py
+# -*- coding: utf-8 -*-
+"""RSS 2.0 / RSS 1.0 / Atom 빠른 파싱 경로.
+
+- lxml iterparse로 항목의 title / link / 날짜 원문만 꺼내고, limit개를 채우면 즉시 중단
+- 날짜는 형식별 strptime/fromisoformat 파서를 소스마다 '마지막으로 성공한 것'부터 시도
+- 빠른 경로가 안전하지 않은 피드(깨진 XML, 제목 안 HTML, 상대 링크 등)는 None을 반환 →
+  호출 측에서 feedparser / dateutil로 폴백하고 STATS에 횟수를 남깁니다.
+"""
+
+import io, threading
+from datetime import datetime, timezone
+
+from lxml import etree
+from dateutil import parser as dateparser
+
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_RSS1 = "{http://purl.org/rss/1.0/}"
+_DC = "{http://purl.org/dc/elements/1.1/}"
+_ENTRY_TAGS = ("item", _RSS1 + "item", _ATOM + "entry")
+
+
+class ParseStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = {"fast_feeds": 0, "fallback_feeds": 0, "fast_dates": 0, "fallback_dates": 0}
+
+    def incr(self, key: str, n: int = 1):
+        with self._lock:
+            self.counts[key] += n
+
+    def reset(self):
+        with self._lock:
+            for k in self.counts:
+                self.counts[k] = 0
+
+
+STATS = ParseStats()
+
+
+def _text(el) -> str:
+    return "".join(el.itertext()) if el is not None else ""
+
+def _child(el, *tags):
+    for t in tags:
+        c = el.find(t)
+        if c is not None:
+            return c
+    return None
+
+def _atom_link(entry) -> str:
+    # feedparser와 같이 rel="alternate"(또는 rel 없음) 링크 우선
+    first = ""
+    for l in entry.iterfind(_ATOM + "link"):
+        href = (l.get("href") or "").strip()
+        if not href:
+            continue
+        if l.get("rel", "alternate") == "alternate":
+            return href
+        first = first or href
+    return first
+
+def _entry_fields(el):
+    """(title, link, date_raw) — 빠른 경로로 처리할 수 없는 항목이면 None."""
+    if el.tag == _ATOM + "entry":
+        title_el = el.find(_ATOM + "title")
+        if title_el is not None and title_el.get("type") in ("html", "xhtml"):
+            return None
+        link = _atom_link(el)
+        date_el = _child(el, _ATOM + "published", _ATOM + "updated")
+    else:
+        ns = _RSS1 if el.tag.startswith(_RSS1) else ""
+        title_el = el.find(ns + "title")
+        link = _text(el.find(ns + "link")).strip()
+        if not link:
+            guid = el.find("guid")
+            if guid is not None and guid.get("isPermaLink", "true") != "false":
+                link = _text(guid).strip()
+        date_el = _child(el, ns + "pubDate", _DC + "date", _ATOM + "published", _ATOM + "updated")
+
+    title = _text(title_el)
+    # 제목 안 마크업/상대 링크는 feedparser의 정리·해석 규칙을 따르도록 폴백
+    if "<" in title or (link and not link.lower().startswith(("http://", "https://"))):
+        return None
+    return title, link, _text(date_el).strip()
+
+def parse_feed_fast(body: bytes, limit: int = 50):
+    """앞에서부터 최대 limit개 항목의 (title, link, date_raw) 리스트. 빠른 경로 불가 시 None."""
+    out = []
+    try:
+        ctx = etree.iterparse(io.BytesIO(body or b""), events=("end",), tag=_ENTRY_TAGS,
+                              resolve_entities=False, no_network=True, huge_tree=False)
+        for _, el in ctx:
+            fields = _entry_fields(el)
+            if fields is None:
+                return None
+            out.append(fields)
+            el.clear()
+            if len(out) >= limit:
+                break  # 나머지는 읽지 않음
+    except (etree.XMLSyntaxError, ValueError):
+        return None
+    return out
+
+
+# ----------------------------
+# 날짜: 소스별로 학습되는 형식 파서
+# ----------------------------
+def _rfc822(fmt):
+    def parse(s):
+        s = s.strip()
+        for name in (" GMT", " UTC", " UT", " Z"):
+            if s.endswith(name):
+                s = s[: -len(name)] + " +0000"
+                break
+        return datetime.strptime(s, fmt)
+    return parse
+
+def _iso(s):
+    dt = datetime.fromisoformat(s.strip())
+    return dt
+
+def _naive(fmt):
+    return lambda s: datetime.strptime(s.strip(), fmt)
+
+DATE_PARSERS = [
+    _rfc822("%a, %d %b %Y %H:%M:%S %z"),
+    _iso,
+    _rfc822("%a, %d %b %Y %H:%M %z"),
+    _rfc822("%d %b %Y %H:%M:%S %z"),
+    _naive("%Y-%m-%d %H:%M:%S"),
+    _naive("%Y.%m.%d %H:%M:%S"),
+]
+
+_learned = {}
+_learned_lock = threading.Lock()
+
+def parse_date(source: str, raw: str) -> str:
+    """날짜 원문 → ISO 문자열(시간대 없으면 UTC, 실패 시 ''). 기존 dateutil 결과와 같게 맞춥니다."""
+    if not raw:
+        return ""
+    with _learned_lock:
+        first = _learned.get(source, 0)
+    order = [first] + [i for i in range(len(DATE_PARSERS)) if i != first]
+    for i in order:
+        try:
+            dt = DATE_PARSERS[i](raw)
+        except ValueError:
+            continue
+        if i != first:
+            with _learned_lock:
+                _learned[source] = i
+        STATS.incr("fast_dates")
+        break
+    else:
+        STATS.incr("fallback_dates")
+        try:
+            dt = dateparser.parse(raw)
+        except Exception:
+            return ""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.isoformat()
@@ -0,0 +1,96 @@
+# hismedi-app/news/fingerprint.py
+# -*- coding: utf-8 -*-
+"""URL / title_hash 중복 검사용 64비트 지문 집합.
+
+문자열 대신 blake2b 64비트 지문을 정렬된 uint64 배열에 보관합니다(항목당 8바이트).
+- np.save/np.load(mmap_mode="r")로 디스크에서 바로 메모리 매핑
+- contains_many()로 수집 배치 전체를 searchsorted 한 번에 조회
+- 64비트 지문 충돌 확률은 100만 건 기준 약 3e-8 → 정확성이 필요하면
+  StoreKeySet처럼 '지문 일치 시 원본으로 재확인' 용도로 씁니다.
+"""
+
+import os, hashlib
+
+import numpy as np
+
+
+def fingerprint64(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b((key or "").encode("utf-8"), digest_size=8).digest(), "little")
+
+def fingerprints(keys) -> np.ndarray:
+    keys = list(keys)
+    return np.fromiter((fingerprint64(k) for k in keys), dtype=np.uint64, count=len(keys))
+
+
+class FingerprintSet:
+    def __init__(self, fps=None):
+        arr = np.asarray(fps if fps is not None else [], dtype=np.uint64)
+        self._arr = np.unique(arr)  # 정렬 + 중복 제거
+        self._pending = set()       # 이번 실행에서 추가된 지문
+
+    @classmethod
+    def from_keys(cls, keys):
+        return cls(fingerprints(k for k in keys if k))
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True):
+        """save()로 저장한 파일을 읽습니다(기본: 메모리 매핑, 이미 정렬/중복 제거된 상태)."""
+        obj = cls.__new__(cls)
+        obj._arr = np.load(path, mmap_mode="r" if mmap else None)
+        obj._pending = set()
+        return obj
+
+    def merged(self) -> np.ndarray:
+        if not self._pending:
+            return np.asarray(self._arr)
+        extra = np.fromiter(self._pending, dtype=np.uint64, count=len(self._pending))
+        return np.union1d(self._arr, extra)
+
+    def save(self, path: str):
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        tmp = path + ".tmp.npy"
+        np.save(tmp, self.merged())
+        os.replace(tmp, path)
+
+    def _has_fp(self, fp: int) -> bool:
+        if fp in self._pending:
+            return True
+        i = int(np.searchsorted(self._arr, np.uint64(fp)))
+        return i < len(self._arr) and int(self._arr[i]) == fp
+
+    def __contains__(self, key) -> bool:
+        return self._has_fp(fingerprint64(key))
+
+    def add(self, key):
+        fp = fingerprint64(key)
+        if not self._has_fp(fp):
+            self._pending.add(fp)
+
+    def update(self, keys):
+        for k in keys:
+            if k:
+                self.add(k)
+
+    def contains_many(self, keys):
+        """keys 각각의 포함 여부(bool 리스트)."""
+        fps = fingerprints(keys)
+        if len(fps) == 0:
+            return []
+        if len(self._arr):
+            idx = np.searchsorted(self._arr, fps)
+            idx_c = np.minimum(idx, len(self._arr) - 1)
+            hit = (idx < len(self._arr)) & (np.asarray(self._arr)[idx_c] == fps)
+        else:
+            hit = np.zeros(len(fps), dtype=bool)
+        if self._pending:
+            hit |= np.isin(fps, np.fromiter(self._pending, dtype=np.uint64, count=len(self._pending)))
+        return hit.tolist()
+
+    def __len__(self):
+        return len(self._arr) + len(self._pending)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self._arr.nbytes) + 8 * len(self._pending)
@@ -3,13 +3,25 @@ import gspread
 from google.oauth2.service_account import Credentials
 
 # summary 제거(요약 생성/저장 안 함)
+# ingested_at(J): 저장소에 추가한 시각(BatchSink가 append 직전에 기록) — reader 증분 동기화 키
 NEWS_HEADERS = [
   "published_at","source","title","url","url_canonical","tags",
-  "title_hash","simhash","duplicate_of"
+  "title_hash","simhash","duplicate_of","ingested_at"
 ]
 
 META_HEADERS = ["key","value"]
 
+# 실행 계측 요약(news.metrics.RunMetrics.sheet_rows)
+METRICS_HEADERS = [
+  "run_at","scope","name","wall_ms","status","bytes",
+  "seen","tagged","deduped","inserted","error"
+]
+
+# 중복 제거에 필요한 NEWS 열만: D=url, E=url_canonical, G=title_hash, H=simhash
+NEWS_INDEX_COLUMNS = ("D", "E", "G", "H")
+# 로컬 스냅샷에 반영된 NEWS 데이터 행 수(META)
+NEWS_WATERMARK_KEY = "news_row_watermark"
+
 def _client():
     sa_json = os.getenv("GOOGLE_SERVICE_ACCOUNT_JSON","").strip()
     if not sa_json:
@@ -46,7 +58,72 @@ def ensure_tabs(sh):
 
     return ws_news, ws_meta
 
+def ensure_metrics_tab(sh):
+    """METRICS 탭(실행/단계/소스별 요약 행)이 없으면 생성합니다."""
+    try:
+        return sh.worksheet("METRICS")
+    except Exception:
+        ws = sh.add_worksheet(title="METRICS", rows=2000, cols=len(METRICS_HEADERS))
+        ws.append_row(METRICS_HEADERS, value_input_option="RAW")
+        return ws
+
+class MetaSession:
+    """META 탭을 한 번 읽어 dict로 보관하는 세션.
+    - get: 읽기 캐시(추가 API 호출 없음)
+    - set: 버퍼에 모았다가 flush()에서 batch_update 1회 + append_rows 1회로 반영
+    - 같은 key가 여러 행이면 기존 meta_get/meta_set처럼 첫 행을 사용
+    """
+
+    def __init__(self, ws_meta):
+        self.ws = ws_meta
+        self._dirty = {}
+        self._read()
+
+    def _read(self):
+        self._values = {}
+        self._row_of = {}
+        rows = self.ws.get_all_values()
+        self._n_rows = len(rows)
+        for i, r in enumerate(rows[1:], start=2):
+            if len(r) >= 1 and r[0] not in self._row_of:
+                self._row_of[r[0]] = i
+                self._values[r[0]] = r[1] if len(r) >= 2 else ""
+
+    def get(self, key: str) -> str:
+        return self._values.get(key, "")
+
+    def reload(self):
+        """대기 중인 쓰기를 반영한 뒤 META를 다시 읽음(상주 모드의 설정 변경 반영)."""
+        self.flush()
+        self._read()
+
+    def set(self, key: str, value: str):
+        self._values[key] = value
+        self._dirty[key] = value
+
+    def flush(self):
+        if not self._dirty:
+            return
+        updates = [
+            {"range": f"B{self._row_of[k]}", "values": [[v]]}
+            for k, v in self._dirty.items() if k in self._row_of
+        ]
+        appends = [[k, v] for k, v in self._dirty.items() if k not in self._row_of]
+        if updates:
+            self.ws.batch_update(updates, value_input_option="RAW")
+        if appends:
+            self.ws.append_rows(appends, value_input_option="RAW")
+            # 이후 flush에서는 append 대신 해당 행을 갱신
+            for k, _ in appends:
+                self._n_rows += 1
+                self._row_of[k] = self._n_rows
+        self._dirty = {}
+
 def meta_get(ws_meta, key: str):
+    if isinstance(ws_meta, MetaSession):
+        return ws_meta.get(key)
+    if hasattr(ws_meta, "get_meta"):  # news.storage 백엔드
+        return ws_meta.get_meta(key)
     rows = ws_meta.get_all_values()
     for r in rows[1:]:
         if len(r) >= 2 and r[0] == key:
@@ -54,9 +131,42 @@ def meta_get(ws_meta, key: str):
     return ""
 
 def meta_set(ws_meta, key: str, value: str):
+    if isinstance(ws_meta, MetaSession):
+        ws_meta.set(key, value)
+        return
+    if hasattr(ws_meta, "set_meta"):
+        ws_meta.set_meta(key, value)
+        return
     rows = ws_meta.get_all_values()
     for i, r in enumerate(rows[1:], start=2):
         if len(r) >= 1 and r[0] == key:
             ws_meta.update(f"B{i}", [[value]])
             return
     ws_meta.append_row([key, value], value_input_option="RAW")
+
+def _column_groups(columns):
+    """("D","E","G","H") → [["D","E"], ["G","H"]] (연속 열끼리 묶어 범위 수 최소화)"""
+    groups = []
+    for c in columns:
+        if groups and ord(c) == ord(groups[-1][-1]) + 1:
+            groups[-1].append(c)
+        else:
+            groups.append([c])
+    return groups
+
+def read_news_columns(ws_news, first_row: int, columns=NEWS_INDEX_COLUMNS):
+    """NEWS 탭 first_row행(1=헤더)부터 끝까지 columns 열만 범위 읽기합니다.
+    - 연속 열은 한 범위로 묶어 batch_get 1회
+    - 각 행은 columns 순서의 리스트(빈 칸은 '')
+    """
+    groups = _column_groups(columns)
+    parts = ws_news.batch_get([f"{g[0]}{first_row}:{g[-1]}" for g in groups])
+    n = max((len(p) for p in parts), default=0)
+    rows = []
+    for i in range(n):
+        row = []
+        for g, p in zip(groups, parts):
+            cells = list(p[i]) if i < len(p) else []
+            row.extend(cells[:len(g)] + [""] * (len(g) - len(cells)))
+        rows.append(row)
+    return rows
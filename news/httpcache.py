@@ -0,0 +1,82 @@
+# hismedi-app/news/httpcache.py
+# -*- coding: utf-8 -*-
+"""RSS 조건부 GET 캐시(ETag / Last-Modified / 본문 해시).
+
+- 피드 URL별로 검증자(ETag, Last-Modified)와 본문 SHA-256을 JSON 파일에 저장합니다.
+- 304 응답이거나 본문이 이전과 같으면 feedparser 파싱을 건너뜁니다.
+- 저장은 시트 기록이 끝난 뒤 save()로 한 번만 합니다(중간 실패 시 다음 실행에서 다시 받음).
+"""
+
+import os, json, hashlib, threading
+
+
+class ValidatorCache:
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries = {}
+        self.stats = {
+            "not_modified": 0,    # 304 응답
+            "same_body": 0,       # 200이지만 본문 동일
+            "miss": 0,            # 새 본문 → 파싱
+            "bytes_saved": 0,     # 304로 다운로드하지 않은 바이트(이전 본문 크기 기준)
+            "parses_saved": 0,
+        }
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self._entries = json.load(f) or {}
+        except (OSError, ValueError):
+            self._entries = {}
+
+    def request_headers(self, url: str) -> dict:
+        """저장된 검증자로 조건부 요청 헤더를 만듭니다."""
+        with self._lock:
+            ent = self._entries.get(url) or {}
+        headers = {}
+        if ent.get("etag"):
+            headers["If-None-Match"] = ent["etag"]
+        if ent.get("last_modified"):
+            headers["If-Modified-Since"] = ent["last_modified"]
+        return headers
+
+    def is_unchanged(self, url: str, r) -> bool:
+        """응답을 기록하고, 파싱을 건너뛰어도 되면 True를 반환합니다."""
+        with self._lock:
+            ent = self._entries.get(url) or {}
+            if r.status_code == 304:
+                self.stats["not_modified"] += 1
+                self.stats["parses_saved"] += 1
+                self.stats["bytes_saved"] += int(ent.get("size", 0))
+                return True
+
+            body = r.content or b""
+            digest = hashlib.sha256(body).hexdigest()
+            unchanged = bool(ent) and ent.get("sha256") == digest
+            self._entries[url] = {
+                "etag": r.headers.get("ETag", ""),
+                "last_modified": r.headers.get("Last-Modified", ""),
+                "sha256": digest,
+                "size": len(body),
+            }
+            if unchanged:
+                self.stats["same_body"] += 1
+                self.stats["parses_saved"] += 1
+            else:
+                self.stats["miss"] += 1
+            return unchanged
+
+    def save(self, exclude=()):
+        """exclude(피드 URL)의 검증자는 파일에 남기지 않습니다(아직 저장되지 않은 행이 있는 피드)."""
+        d = os.path.dirname(self.path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        tmp = self.path + ".tmp"
+        exclude = set(exclude)
+        with self._lock:
+            entries = {u: e for u, e in self._entries.items() if u not in exclude}
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(entries, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+    def summary(self) -> str:
+        return json.dumps(self.stats, ensure_ascii=False)
@@ -0,0 +1,123 @@
+# hismedi-app/news/metrics.py
+# -*- coding: utf-8 -*-
+"""스크레이퍼 실행 계측.
+
+- 단계별 시간: stage(name) 컨텍스트로 누적(병렬 수집 안의 fetch/parse/tag는 스레드 시간 합계)
+- 소스별 기록: 지연(ms) / 바이트 / HTTP 상태 / 본 항목 / 태그된 항목 / 중복 제거 / 삽입 / 오류 클래스
+- 출력: JSON Lines 실행 로그(append) + sheet_rows() 요약(저장소 append_metrics 1회 → METRICS 탭/테이블)
+- 프로파일: profiled(path)로 한 실행을 cProfile로 저장하고 상위 함수 출력
+"""
+
+import os, io, json, time, pstats, cProfile, threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+SOURCE_COUNTERS = ("bytes", "seen", "tagged", "deduped", "near_dup", "inserted")
+
+
+class RunMetrics:
+    def __init__(self):
+        self.run_at = datetime.now(timezone.utc).isoformat()
+        self._t0 = time.perf_counter()
+        self._lock = threading.Lock()
+        self.stages = {}
+        self.sources = {}
+        self.extra = {}
+
+    # ----------------------------
+    # 단계
+    # ----------------------------
+    @contextmanager
+    def stage(self, name: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - t0)
+
+    def add_time(self, name: str, seconds: float):
+        with self._lock:
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    # ----------------------------
+    # 소스
+    # ----------------------------
+    def _source(self, name: str) -> dict:
+        rec = self.sources.get(name)
+        if rec is None:
+            rec = self.sources[name] = {"latency_ms": 0.0, "status": "", "error": "", **{k: 0 for k in SOURCE_COUNTERS}}
+        return rec
+
+    def incr(self, source: str, key: str, n: int = 1):
+        with self._lock:
+            self._source(source)[key] += n
+
+    def record(self, source: str, latency_sec: float = 0.0, status="", nbytes: int = 0, error: BaseException = None):
+        """응답 한 건(또는 실패)을 소스에 누적. 상태는 마지막 값, 오류는 클래스 이름."""
+        with self._lock:
+            rec = self._source(source)
+            rec["latency_ms"] += latency_sec * 1000
+            rec["bytes"] += int(nbytes or 0)
+            if status != "":
+                rec["status"] = str(status)
+            if error is not None:
+                rec["error"] = type(error).__name__
+
+    def set(self, key: str, value):
+        with self._lock:
+            self.extra[key] = value
+
+    # ----------------------------
+    # 출력
+    # ----------------------------
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "run_at": self.run_at,
+                "wall_ms": round((time.perf_counter() - self._t0) * 1000, 1),
+                "stages_ms": {k: round(v * 1000, 1) for k, v in self.stages.items()},
+                "sources": {k: dict(v, latency_ms=round(v["latency_ms"], 1)) for k, v in self.sources.items()},
+                **self.extra,
+            }
+
+    def write_jsonl(self, path: str):
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(self.to_dict(), ensure_ascii=False) + "\n")
+
+    def sheet_rows(self):
+        """METRICS 탭 행: 실행 1행 + 단계별 + 소스별."""
+        d = self.to_dict()
+        at = d["run_at"]
+        # 열 순서는 gsheet.METRICS_HEADERS
+        rows = [[at, "run", "total", d["wall_ms"], "", "", "", "", "", d.get("inserted", ""), d.get("error", "")]]
+        for name, ms in d["stages_ms"].items():
+            rows.append([at, "stage", name, ms, "", "", "", "", "", "", ""])
+        for name, s in d["sources"].items():
+            rows.append([at, "source", name, s["latency_ms"], s["status"], s["bytes"],
+                         s["seen"], s["tagged"], s["deduped"], s["inserted"], s["error"]])
+        return rows
+
+
+@contextmanager
+def profiled(path: str = "", top: int = 25):
+    """path가 있으면 블록을 cProfile로 실행해 .prof 저장 + 누적 시간 상위 top개 출력."""
+    if not path:
+        yield
+        return
+    prof = cProfile.Profile()
+    prof.enable()
+    try:
+        yield
+    finally:
+        prof.disable()
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        prof.dump_stats(path)
+        buf = io.StringIO()
+        pstats.Stats(prof, stream=buf).sort_stats("cumulative").print_stats(top)
+        print(f"profile saved: {path}")
+        print(buf.getvalue())
@@ -0,0 +1,118 @@
+# hismedi-app/news/redirects.py
+# -*- coding: utf-8 -*-
+"""Google News 리다이렉트 링크 → 언론사 원문 URL 해석(영구 캐시).
+
+news.google.com/rss/articles/<id> 링크는 canonicalize_url로는 원문 URL이 되지 않아
+소스 간 URL 중복 제거가 빗나가고, reader.py도 리다이렉트를 거쳐 본문을 받습니다.
+- 1차: <id>(base64 protobuf)에 원문 URL이 그대로 들어 있으면 네트워크 없이 추출
+- 2차: 기사 페이지를 받아 최종 URL(리다이렉트) 또는 data-n-au 속성에서 추출
+- 결과는 JSON 캐시에 저장, 실패는 retry_days 동안 다시 시도하지 않음(원래 링크 유지)
+"""
+
+import os, re, json, base64, threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlsplit
+
+from news.config import DEFAULTS
+
+_ARTICLE_ID = re.compile(r"/(?:rss/)?articles/([A-Za-z0-9_-]+)")
+_EMBEDDED_URL = re.compile(rb"https?://[\x21-\x7e]+")
+_DATA_N_AU = re.compile(r'data-n-au="([^"]+)"')
+
+
+def is_google_news(url: str) -> bool:
+    return (urlsplit(url or "").hostname or "").lower() == "news.google.com"
+
+def decode_google_news(url: str) -> str:
+    """기사 id에 원문 URL이 들어 있는 (구)형식이면 그 URL, 아니면 ''."""
+    m = _ARTICLE_ID.search(urlsplit(url or "").path)
+    if not m:
+        return ""
+    aid = m.group(1)
+    try:
+        raw = base64.urlsafe_b64decode(aid + "=" * (-len(aid) % 4))
+    except (ValueError, TypeError):
+        return ""
+    found = _EMBEDDED_URL.search(raw)
+    return found.group(0).decode("ascii") if found else ""
+
+
+class RedirectCache:
+    def __init__(self, path: str, retry_days: int = 0):
+        self.path = path
+        self.retry_days = int(retry_days or DEFAULTS["redirect_retry_days"])
+        self._lock = threading.Lock()
+        self.stats = {"hit": 0, "decoded": 0, "fetched": 0, "failed": 0}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self._entries = json.load(f) or {}
+        except (OSError, ValueError):
+            self._entries = {}
+
+    def get(self, url: str):
+        """캐시된 최종 URL(실패 기록이면 '', 없거나 재시도 시점이면 None)."""
+        with self._lock:
+            ent = self._entries.get(url)
+        if not ent:
+            return None
+        if ent.get("final"):
+            return ent["final"]
+        at = datetime.fromisoformat(ent.get("at", "1970-01-01T00:00:00+00:00"))
+        if datetime.now(timezone.utc) - at >= timedelta(days=self.retry_days):
+            return None
+        return ""
+
+    def put(self, url: str, final: str):
+        with self._lock:
+            self._entries[url] = {"final": final, "at": datetime.now(timezone.utc).isoformat()}
+
+    def incr(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def save(self):
+        d = os.path.dirname(self.path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        tmp = self.path + ".tmp"
+        with self._lock:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+
+def resolve_url(url: str, cache: RedirectCache, get) -> str:
+    """Google News 링크의 원문 URL(해석 실패 시 원래 url). get(url) → requests.Response."""
+    if not is_google_news(url):
+        return url
+    cached = cache.get(url)
+    if cached is not None:
+        cache.incr("hit")
+        return cached or url
+
+    final = decode_google_news(url)
+    if final:
+        cache.incr("decoded")
+    else:
+        try:
+            r = get(url)
+            if not is_google_news(r.url):
+                final = r.url
+            else:
+                m = _DATA_N_AU.search(r.text or "")
+                final = m.group(1) if m else ""
+        except Exception:
+            final = ""
+        cache.incr("fetched" if final else "failed")
+    cache.put(url, final)
+    return final or url
+
+def resolve_urls(urls, cache: RedirectCache, get, workers: int = 4) -> dict:
+    """고유 URL들을 병렬로 해석해 {url: 최종 URL} 반환."""
+    uniq = list(dict.fromkeys(u for u in urls if is_google_news(u)))
+    if not uniq:
+        return {}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as ex:
+        finals = list(ex.map(lambda u: resolve_url(u, cache, get), uniq))
+    return dict(zip(uniq, finals))
@@ -1,17 +1,40 @@
-import os, re, time, hashlib
+import os, re, json, time, hashlib
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from datetime import datetime, timezone
-from dateutil import parser as dateparser
+from functools import lru_cache
 
 import feedparser
-import requests
-from bs4 import BeautifulSoup
-
-from news.config import KEYWORDS, NEGATIVE_HINTS, RSS_SOURCES, DEFAULTS
-from news.gsheet import open_sheet, ensure_tabs, meta_get, meta_set
+import numpy as np
+
+from news.config import RSS_SOURCES, BOARD_SOURCES, DEFAULTS
+from news.storage import open_storage, BatchSink
+from news.httpcache import ValidatorCache
+from news.transport import fetch, configure_fetch_limits, CircuitBreaker
+from news.simindex import SimHashIndex
+from news.tagger import TAGGER
+from news.state import DedupStore, StoreKeySet
+from news.fingerprint import FingerprintSet
+from news.boards import crawl_board
+from news.feeds import parse_feed_fast, parse_date, STATS as PARSE_STATS
+from news.redirects import RedirectCache, resolve_urls
+from news.metrics import RunMetrics, profiled
+
+# 스트리밍 단계(원문 URL 해석 / SimHash 일괄 계산) 처리 단위
+STREAM_CHUNK = 200
 
 # ----------------------------
 # 유틸
 # ----------------------------
+def chunked(iterable, n: int):
+    """iterable → 최대 n개짜리 리스트 생성기."""
+    it = iter(iterable)
+    while True:
+        chunk = list(islice(it, n))
+        if not chunk:
+            return
+        yield chunk
+
 def normalize_ws(s: str) -> str:
     return re.sub(r"\s+", " ", (s or "")).strip()
 
@@ -25,26 +48,38 @@ def canonicalize_url(url: str) -> str:
 def sha256_hex(s: str) -> str:
     return hashlib.sha256((s or "").encode("utf-8")).hexdigest()
 
-
-# ----------------------------
-# HTML 크롤링 보조
-# ----------------------------
-def _parse_date_any(s: str) -> str:
-    """YYYY.MM.DD / YYYY-MM-DD 형태를 UTC ISO로 변환(실패 시 '')."""
-    s = (s or "").strip().replace(".", "-")
-    m = re.search(r"(\d{4}-\d{2}-\d{2})", s)
-    if not m:
-        return ""
-    try:
-        dt = datetime.strptime(m.group(1), "%Y-%m-%d").replace(tzinfo=timezone.utc)
-        return dt.isoformat()
-    except Exception:
-        return ""
+def cache_dir() -> str:
+    """로컬 캐시 디렉터리(NEWS_CACHE_DIR 환경변수로 변경 가능)."""
+    return os.getenv("NEWS_CACHE_DIR", "").strip() or DEFAULTS["cache_dir"]
 
 
 # ----------------------------
 # 정부/기관/협회: HTML 목록 크롤러
 # ----------------------------
+def _fetch_pages(urls, ua: str, timeout_sec: int, retries: int, backoff_sec: float, breaker=None, metrics=None, source: str = ""):
+    """목록 페이지들을 병렬로 받아 입력 순서대로 반환합니다(호스트별 제한은 http_get에서 적용).
+    실패한 페이지는 예외 객체를 그 자리에 넣습니다(앞 페이지 결과를 잃지 않도록, 판단은 crawl_board).
+    """
+    def get(u):
+        t0 = time.perf_counter()
+        try:
+            r = http_get(u, ua=ua, timeout_sec=timeout_sec, retries=retries, backoff_sec=backoff_sec, breaker=breaker)
+        except Exception as e:
+            if metrics is not None:
+                dt = time.perf_counter() - t0
+                metrics.add_time("fetch", dt)
+                metrics.record(source, dt, getattr(getattr(e, "response", None), "status_code", ""), error=e)
+            return e
+        if metrics is not None:
+            dt = time.perf_counter() - t0
+            metrics.add_time("fetch", dt)
+            metrics.record(source, dt, r.status_code, len(r.content))
+        return r
+    if len(urls) <= 1:
+        return [get(u) for u in urls]
+    with ThreadPoolExecutor(max_workers=len(urls)) as ex:
+        return list(ex.map(get, urls))
+
 def _emit_item(source: str, title: str, link: str, published_at: str):
     title = normalize_ws(title).replace("새글", "").strip()
     link = canonicalize_url(link)
@@ -62,75 +97,53 @@ def _emit_item(source: str, title: str, link: str, published_at: str):
         "tags": ",".join(tags),
     }
 
-def crawl_mohw_press(ua: str, timeout_sec: int, retries: int, backoff_sec: float, pages: int = 1):
-    base = "https://www.mohw.go.kr/board.es?mid=a10503010100&bid=0027"
-    out = []
-    for p in range(1, max(1, pages) + 1):
-        url = f"{base}&nPage={p}"
-        r = http_get(url, ua=ua, timeout_sec=timeout_sec, retries=retries, backoff_sec=backoff_sec)
-        soup = BeautifulSoup(r.text, "html.parser")
-        for tr in soup.select("table tbody tr"):
-            a = tr.select_one("a[href]")
-            if not a:
-                continue
-            href = (a.get("href") or "").strip()
-            link = urljoin("https://www.mohw.go.kr/", href)
-            title = a.get_text(" ", strip=True)
-            published_at = ""
-            for td in tr.select("td"):
-                published_at = _parse_date_any(td.get_text(" ", strip=True))
-                if published_at:
-                    break
-            it = _emit_item("보건복지부-보도자료", title, link, published_at)
-            if it:
-                out.append(it)
-    return out
-
-def crawl_moel_press(ua: str, timeout_sec: int, retries: int, backoff_sec: float, pages: int = 1):
-    base = "https://www.moel.go.kr/news/enews/report/enewsList.do"
-    out = []
-    for p in range(1, max(1, pages) + 1):
-        url = f"{base}?pageIndex={p}"
-        r = http_get(url, ua=ua, timeout_sec=timeout_sec, retries=retries, backoff_sec=backoff_sec)
-        soup = BeautifulSoup(r.text, "html.parser")
-        for tr in soup.select("table tbody tr"):
-            a = tr.select_one('a[href*="enewsView.do"]')
-            if not a:
-                continue
-            href = (a.get("href") or "").strip()
-            link = urljoin("https://www.moel.go.kr/", href)
-            title = a.get_text(" ", strip=True)
-            published_at = ""
-            for td in tr.select("td"):
-                published_at = _parse_date_any(td.get_text(" ", strip=True))
-                if published_at:
-                    break
-            it = _emit_item("고용노동부-보도자료", title, link, published_at)
-            if it:
-                out.append(it)
-    return out
-
-
-
-
-
-
-
-
-
+def crawl_board_source(key: str, ua: str, timeout_sec: int, retries: int, backoff_sec: float,
+                       pages: int = 1, breaker=None, known=None, max_pages: int = 0, metrics=None):
+    """BOARD_SOURCES[key] 게시판 크롤링.
+    - pages: 항상 받는 최소 페이지 수
+    - known(이미 저장된 url_canonical 집합)을 주면 max_pages까지, 새 항목이 없는 페이지에서 중단
+    - metrics(RunMetrics)를 주면 페이지별 응답과 본/태그된 행 수를 spec["source"]에 기록
+    """
+    spec = BOARD_SOURCES[key]
+    metrics = metrics if metrics is not None else RunMetrics()
+
+    def emit(title, link, published_at):
+        it = _emit_item(spec["source"], title, link, published_at)
+        metrics.incr(spec["source"], "seen")
+        if it:
+            metrics.incr(spec["source"], "tagged")
+        return it
+
+    return crawl_board(
+        spec,
+        fetch_pages=lambda urls: _fetch_pages(urls, ua, timeout_sec, retries, backoff_sec, breaker=breaker,
+                                              metrics=metrics, source=spec["source"]),
+        emit=emit,
+        min_pages=pages,
+        max_pages=max_pages or pages,
+        known=known,
+        window=DEFAULTS["per_host_limit"],
+    )
+
+def crawl_mohw_press(ua: str, timeout_sec: int, retries: int, backoff_sec: float, pages: int = 1, breaker=None, known=None, max_pages: int = 0):
+    return crawl_board_source("mohw", ua, timeout_sec, retries, backoff_sec, pages=pages, breaker=breaker, known=known, max_pages=max_pages)
+
+def crawl_moel_press(ua: str, timeout_sec: int, retries: int, backoff_sec: float, pages: int = 1, breaker=None, known=None, max_pages: int = 0):
+    return crawl_board_source("moel", ua, timeout_sec, retries, backoff_sec, pages=pages, breaker=breaker, known=known, max_pages=max_pages)
 
 # ----------------------------
 # 태그 분류
 # ----------------------------
 def pick_tags(text: str):
-    t = text or ""
-    if any(h in t for h in NEGATIVE_HINTS):
-        return []
-    tags = []
-    for tag, kws in KEYWORDS.items():
-        if any(k in t for k in kws):
-            tags.append(tag)
-    return tags
+    """KEYWORDS 순서대로 일치 태그(제외 힌트가 있으면 []). Aho–Corasick 한 번 스캔."""
+    return TAGGER.pick(text or "")
+
+def pick_tags_batch(texts):
+    return TAGGER.pick_batch(texts)
+
+def explain_tags(text: str):
+    """(tags, {tag: [일치 키워드]}, [일치 제외 힌트]) — 태그가 붙은 이유 확인용."""
+    return TAGGER.explain(text or "")
 
 # ----------------------------
 # SimHash (제목 기반)
@@ -141,13 +154,18 @@ def tokenize(text: str):
     toks = [w for w in text.split() if len(w) >= 2]
     return toks[:200]
 
+@lru_cache(maxsize=200_000)
+def _token_hash64(tok: str) -> int:
+    # md5의 하위 64비트(= int(hexdigest, 16)에서 simhash64가 쓰는 0~63번 비트)
+    return int.from_bytes(hashlib.md5(tok.encode("utf-8")).digest()[8:], "big")
+
 def simhash64(text: str):
     toks = tokenize(text)
     if not toks:
         return ""
     v = [0]*64
     for tok in toks:
-        h = int(hashlib.md5(tok.encode("utf-8")).hexdigest(), 16)
+        h = _token_hash64(tok)
         for i in range(64):
             v[i] += 1 if ((h >> i) & 1) else -1
     out = 0
@@ -156,55 +174,89 @@ def simhash64(text: str):
             out |= (1 << i)
     return str(out)
 
+def simhash64_batch(texts):
+    """simhash64를 여러 제목에 한 번에 적용합니다(결과 문자열은 simhash64와 비트 단위로 동일).
+    - 토큰 해시는 _token_hash64 메모 캐시 사용
+    - 전체 토큰을 uint64 배열 → (토큰 수 × 64) 비트 행렬로 풀고, 제목별 구간 합으로 투표
+    """
+    tok_lists = [tokenize(t) for t in texts]
+    out = [""] * len(tok_lists)
+    counts = np.fromiter((len(toks) for toks in tok_lists), dtype=np.int64, count=len(tok_lists))
+    if not counts.any():
+        return out
+
+    hashes = np.fromiter(
+        (_token_hash64(tok) for toks in tok_lists for tok in toks),
+        dtype=np.uint64, count=int(counts.sum()),
+    )
+    # 리틀엔디언 바이트 + bitorder="little" → 열 i가 곧 비트 i
+    bits = np.unpackbits(hashes.astype("<u8").view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+
+    nz = np.flatnonzero(counts)
+    starts = (np.cumsum(counts) - counts)[nz]
+    ones = np.add.reduceat(bits, starts, axis=0, dtype=np.int64)
+    # v[i] = ones - (n - ones) >= 0  ⇔  2·ones >= n
+    keep = (2 * ones >= counts[nz, None]).astype(np.uint8)
+    packed = np.packbits(keep, axis=1, bitorder="little").view("<u8").ravel()
+    for i, v in zip(nz.tolist(), packed.tolist()):
+        out[i] = str(v)
+    return out
+
 def hamming(a: int, b: int) -> int:
     return (a ^ b).bit_count()
 
 # ----------------------------
 # HTTP GET helper (retry / timeout / UA)
 # ----------------------------
-def http_get(url: str, ua: str, timeout_sec: int, retries: int, backoff_sec: float):
-    last_err = None
-    for attempt in range(retries + 1):
-        try:
-            r = requests.get(url, headers={"User-Agent": ua}, timeout=timeout_sec, allow_redirects=True)
-            r.raise_for_status()
-            return r
-        except Exception as e:
-            last_err = e
-            if attempt < retries:
-                time.sleep(backoff_sec * (attempt + 1))
-            else:
-                break
-    raise last_err
+def http_get(url: str, ua: str, timeout_sec: int, retries: int, backoff_sec: float, cache=None, breaker=None,
+             breaker_scope: str = ""):
+    """news.transport.fetch 래퍼.
+    - cache(ValidatorCache)를 주면 If-None-Match/If-Modified-Since를 보냅니다(304는 그대로 반환).
+    - breaker(CircuitBreaker)를 주면 연속 실패 호스트는 요청 없이 CircuitOpenError.
+    - breaker_scope: 서킷 브레이커 키를 '<호스트>#<scope>'로 분리(transport.fetch 참고)
+    """
+    headers = cache.request_headers(url) if cache is not None else None
+    return fetch(url, ua=ua, timeout_sec=timeout_sec, retries=retries, backoff_sec=backoff_sec,
+                 headers=headers, breaker=breaker, breaker_scope=breaker_scope)
 
 # ----------------------------
 # 기존 인덱스 로드
 # ----------------------------
-def load_indexes(ws_news, recent_sim_n: int):
-    values = ws_news.get_all_values()
-    if len(values) <= 1:
-        return set(), set(), []
-
-    body = values[1:]
-    url_set = set()
-    titlehash_set = set()
-
-    recent = body[-recent_sim_n:] if len(body) > recent_sim_n else body
-    recent_sim = []  # (sim_int, url)
-    for row in recent:
-        url_c = row[4] if len(row) > 4 else ""
-        th = row[6] if len(row) > 6 else ""
-        sh = row[7] if len(row) > 7 else ""
-        url = row[3] if len(row) > 3 else ""
-        if url_c:
-            url_set.add(url_c)
-        if th:
-            titlehash_set.add(th)
+def load_indexes(storage, recent_sim_n: int, max_hamming: int = DEFAULTS["max_hamming"], store=None, meta=None):
+    """(url_set, titlehash_set, recent_sim) 반환(storage: news.storage 저장소).
+    - recent_sim은 최근 recent_sim_n건의 SimHashIndex(0이면 전체 이력)
+    - store(DedupStore)를 주면 META 워터마크 이후 tail만 읽어 동기화하고, url/title_hash는 인덱스 조회로 확인
+    - store가 없으면 필요한 열(D, E, G, H)만 읽고 url/title_hash는 FingerprintSet으로 보관
+    """
+    recent_sim = SimHashIndex(max_hamming=max_hamming, capacity=recent_sim_n)
+    if store is not None:
+        store.sync(storage, meta)
+        for sim, url in store.recent_sims(recent_sim_n):
+            recent_sim.add(sim, url)
+        return (
+            StoreKeySet(store.has_url, store.fingerprint_set("url_canonical")),
+            StoreKeySet(store.has_title_hash, store.fingerprint_set("title_hash")),
+            recent_sim,
+        )
+
+    body = storage.index_rows(1)  # (url, url_canonical, title_hash, simhash)
+    if not body:
+        return set(), set(), recent_sim
+
+    # url/title_hash는 전체 이력(DedupStore와 동일, 64비트 지문 집합), SimHash는 최근 recent_sim_n건
+    url_set = FingerprintSet.from_keys(r[1] for r in body)
+    titlehash_set = FingerprintSet.from_keys(r[2] for r in body)
+
+    recent = body[-recent_sim_n:] if 0 < recent_sim_n < len(body) else body
+    for url, _, _, sh in recent:
         if sh.isdigit():
-            recent_sim.append((int(sh), url))
+            recent_sim.add(int(sh), url)
     return url_set, titlehash_set, recent_sim
 
 def find_near_duplicate(sim_int: int, recent_sim, max_hamming: int):
+    """recent_sim: SimHashIndex 또는 (sim_int, url) 리스트. 가장 오래된 근접 중복의 url."""
+    if isinstance(recent_sim, SimHashIndex):
+        return recent_sim.find(sim_int, max_hamming)
     for s, url in recent_sim:
         if hamming(sim_int, s) <= max_hamming:
             return url
@@ -213,109 +265,200 @@ def find_near_duplicate(sim_int: int, recent_sim, max_hamming: int):
 # ----------------------------
 # RSS 수집(UA + requests → feedparser)
 # ----------------------------
-def collect_rss(ua: str, timeout_sec: int, retries: int, backoff_sec: float, gov_pages: int):
-    out = []
-    for source_name, feed_url in RSS_SOURCES:
-        # HTML 토큰 소스 처리
-        if (feed_url or '').startswith('HTML:'):
-            try:
-                if feed_url == 'HTML:mohw':
-                    out.extend(crawl_mohw_press(ua, timeout_sec, retries, backoff_sec, pages=gov_pages))
-                elif feed_url == 'HTML:moel':
-                    out.extend(crawl_moel_press(ua, timeout_sec, retries, backoff_sec, pages=gov_pages))
-            except Exception:
-                pass
+def _parse_entries(body: bytes, limit: int = 50):
+    """앞 limit개 항목의 (title, link, date_raw). lxml 빠른 경로 → 실패 시 feedparser."""
+    entries = parse_feed_fast(body, limit=limit)
+    if entries is not None:
+        PARSE_STATS.incr("fast_feeds")
+        return entries
+    PARSE_STATS.incr("fallback_feeds")
+    fp = feedparser.parse(body)
+    return [
+        (
+            getattr(e, "title", ""),
+            getattr(e, "link", ""),
+            getattr(e, "published", None) or getattr(e, "updated", None) or getattr(e, "pubDate", None) or "",
+        )
+        for e in getattr(fp, "entries", [])[:limit]
+    ]
+
+def _source_failed(metrics, source_name: str, e: Exception, latency_sec: float = 0.0):
+    # 한 소스의 실패가 전체 실행을 멈추지 않도록 기록만 하고 빈 결과로 처리
+    status = getattr(getattr(e, "response", None), "status_code", "")
+    metrics.record(source_name, latency_sec, status, error=e)
+    print(f"source failed: {source_name}: {type(e).__name__}: {e}")
+
+def feed_entries(source_name: str, feed_url: str, ua: str, timeout_sec: int, retries: int, backoff_sec: float, cache=None, breaker=None,
+                 metrics=None):
+    """fetch → parse 단계: 피드 하나의 (title, link, dt_raw) 생성기.
+    304 / 지난 실행과 같은 본문 / 실패(소스에 오류 기록)면 아무것도 내보내지 않습니다.
+    """
+    metrics = metrics if metrics is not None else RunMetrics()
+    t0 = time.perf_counter()
+    try:
+        r = http_get(feed_url, ua=ua, timeout_sec=timeout_sec, retries=retries, backoff_sec=backoff_sec, cache=cache, breaker=breaker)
+    except Exception as e:
+        metrics.add_time("fetch", time.perf_counter() - t0)
+        _source_failed(metrics, source_name, e, time.perf_counter() - t0)
+        return
+    dt = time.perf_counter() - t0
+    metrics.add_time("fetch", dt)
+    metrics.record(source_name, dt, r.status_code, len(r.content))
+
+    # 304 또는 지난 실행과 같은 본문이면 새 항목이 없으므로 파싱하지 않음
+    if cache is not None and cache.is_unchanged(feed_url, r):
+        return
+    try:
+        with metrics.stage("parse"):
+            entries = _parse_entries(r.content)
+    except Exception as e:
+        _source_failed(metrics, source_name, e)
+        return
+    metrics.incr(source_name, "seen", len(entries))
+    yield from entries
+
+def tag_entries(source_name: str, entries, metrics=None):
+    """tag 단계: (title, link, dt_raw) → 태그가 붙은 item dict 생성기(태그 없으면 제외)."""
+    metrics = metrics if metrics is not None else RunMetrics()
+    for title, link, dt_raw in entries:
+        title = normalize_ws(title)
+        link = canonicalize_url(link)
+        if not title or not link:
             continue
 
-        try:
-            r = http_get(feed_url, ua=ua, timeout_sec=timeout_sec, retries=retries, backoff_sec=backoff_sec)
-            fp = feedparser.parse(r.content)
-        except Exception:
+        published_at = parse_date(source_name, dt_raw)
+
+        t1 = time.perf_counter()
+        tags = pick_tags(title)
+        metrics.add_time("tag", time.perf_counter() - t1)
+        if not tags:
             continue
 
-        for e in getattr(fp, "entries", [])[:50]:
-            title = normalize_ws(getattr(e, "title", ""))
-            link = canonicalize_url(getattr(e, "link", ""))
-            if not title or not link:
-                continue
-
-            dt_raw = getattr(e, "published", None) or getattr(e, "updated", None) or getattr(e, "pubDate", None)
-            published_at = ""
-            if dt_raw:
-                try:
-                    dt = dateparser.parse(dt_raw)
-                    if dt.tzinfo is None:
-                        dt = dt.replace(tzinfo=timezone.utc)
-                    published_at = dt.isoformat()
-                except Exception:
-                    published_at = ""
-
-            tags = pick_tags(title)
-            if not tags:
-                continue
-
-            out.append({
-                "published_at": published_at,
-                "source": source_name,
-                "title": title,
-                "url": link,
-                "url_canonical": link,
-                "tags": ",".join(tags),
-            })
-    return out
+        metrics.incr(source_name, "tagged")
+        yield {
+            "published_at": published_at,
+            "source": source_name,
+            "title": title,
+            "url": link,
+            "url_canonical": link,
+            "tags": ",".join(tags),
+        }
+
+def _collect_feed(source_name: str, feed_url: str, ua: str, timeout_sec: int, retries: int, backoff_sec: float, cache=None, breaker=None,
+                  metrics=None):
+    return list(tag_entries(
+        source_name,
+        feed_entries(source_name, feed_url, ua, timeout_sec, retries, backoff_sec, cache=cache, breaker=breaker, metrics=metrics),
+        metrics,
+    ))
+
+def _collect_source(source_name: str, feed_url: str, ua: str, timeout_sec: int, retries: int, backoff_sec: float, gov_pages: int,
+                    cache=None, breaker=None, known=None, gov_max_pages: int = 0, metrics=None):
+    metrics = metrics if metrics is not None else RunMetrics()
+    # HTML 토큰 소스 처리('HTML:<BOARD_SOURCES 키>')
+    if (feed_url or '').startswith('HTML:'):
+        key = feed_url[len('HTML:'):]
+        if key not in BOARD_SOURCES:
+            print(f"source skipped: {source_name}: unknown board '{key}'")
+            return []
+        try:
+            return crawl_board_source(key, ua, timeout_sec, retries, backoff_sec, pages=gov_pages,
+                                      breaker=breaker, known=known, max_pages=gov_max_pages, metrics=metrics)
+        except Exception as e:
+            _source_failed(metrics, BOARD_SOURCES[key]["source"], e)
+            return []
+    return _collect_feed(source_name, feed_url, ua, timeout_sec, retries, backoff_sec, cache=cache, breaker=breaker, metrics=metrics)
+
+def unique_sources():
+    """RSS_SOURCES에서 피드 URL 기준 첫 소스만, 원래 순서대로.
+    같은 피드 URL(예: "데일리메디"/"데일리메디(G)")의 두 번째 소스 항목은 어차피 URL 중복으로 전부 걸러지므로 결과 행은 같음.
+    """
+    sources = list({feed_url: (source_name, feed_url) for source_name, feed_url in reversed(RSS_SOURCES)}.values())
+    sources.reverse()
+    return sources
+
+def iter_collect(ua: str, timeout_sec: int, retries: int, backoff_sec: float, gov_pages: int, workers: int = 0, cache=None, breaker=None,
+                 known=None, gov_max_pages: int = 0, metrics=None):
+    """모든 소스를 스레드 풀로 동시에 수집해 item을 내보내는 생성기(소스별 fetch → parse → tag).
+    - RSS_SOURCES 순서대로, 각 소스가 끝나는 대로 내보내므로 뒤 단계는 첫 소스부터 바로 시작합니다.
+    - 메모리에는 끝났지만 아직 소비되지 않은 소스의 결과만 남습니다.
+    - 인자는 collect_rss와 같습니다.
+    """
+    workers = max(1, int(workers or DEFAULTS["fetch_workers"]))
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        futures = [
+            ex.submit(_collect_source, source_name, feed_url, ua, timeout_sec, retries, backoff_sec, gov_pages, cache, breaker, known, gov_max_pages, metrics)
+            for source_name, feed_url in unique_sources()
+        ]
+        for i, f in enumerate(futures):
+            yield from f.result()
+            futures[i] = None
+
+def collect_rss(ua: str, timeout_sec: int, retries: int, backoff_sec: float, gov_pages: int, workers: int = 0, cache=None, breaker=None,
+                known=None, gov_max_pages: int = 0, metrics=None):
+    """모든 소스를 스레드 풀로 동시에 수집합니다(iter_collect 결과를 리스트로).
+    - 결과는 RSS_SOURCES 순서대로 이어 붙이므로 순차 수집과 동일합니다.
+    - 전역/호스트별 동시 요청 수는 configure_fetch_limits 설정을 따릅니다.
+    - known(저장된 url_canonical 집합)을 주면 게시판은 새 항목이 없는 페이지에서 페이지 넘김을 멈춥니다.
+    - metrics(RunMetrics)를 주면 소스별 지연/바이트/상태/항목 수/오류와 fetch·parse·tag 시간을 기록합니다.
+    """
+    return list(iter_collect(ua, timeout_sec, retries, backoff_sec, gov_pages, workers=workers, cache=cache, breaker=breaker,
+                             known=known, gov_max_pages=gov_max_pages, metrics=metrics))
 
 # ----------------------------
-# 메인
+# Google News 리다이렉트 → 원문 URL
 # ----------------------------
-def main():
-    sh = open_sheet()
-    ws_news, ws_meta = ensure_tabs(sh)
-
-    # META 설정값 읽기(없으면 기본값)
-    max_hamming = int(meta_get(ws_meta, "max_hamming") or DEFAULTS["max_hamming"])
-    recent_sim_n = int(meta_get(ws_meta, "recent_sim_n") or DEFAULTS["recent_sim_n"])
-    fetch_timeout_sec = int(meta_get(ws_meta, "fetch_timeout_sec") or DEFAULTS["fetch_timeout_sec"])
-    rss_enabled_raw = meta_get(ws_meta, "rss_enabled")
-    gov_pages_raw = meta_get(ws_meta, "gov_pages")
-    rss_enabled = DEFAULTS["rss_enabled"] if rss_enabled_raw == "" else (rss_enabled_raw.strip().upper() == "TRUE")
-    if gov_pages_raw == "":
-        meta_set(ws_meta, "gov_pages", str(DEFAULTS.get("gov_pages", 1)))
-
-    ua = DEFAULTS["user_agent"]
-    retries = int(DEFAULTS.get("http_retries", 2))
-    backoff = float(DEFAULTS.get("http_backoff_sec", 1.2))
-
-    meta_set(ws_meta, "last_run_at", datetime.now(timezone.utc).isoformat())
-    meta_set(ws_meta, "last_error", "")
-
-    if not rss_enabled:
-        meta_set(ws_meta, "last_inserted_count", "0")
-        return
-
-    url_set, titlehash_set, recent_sim = load_indexes(ws_news, recent_sim_n)
-
-    inserted = 0
-    new_rows = []
-
-    # 1) RSS(전문지) + HTML 크롤링(정부)
-    gov_pages = int(meta_get(ws_meta, "gov_pages") or DEFAULTS.get("gov_pages", 1))
-    items = collect_rss(ua=ua, timeout_sec=fetch_timeout_sec, retries=retries, backoff_sec=backoff, gov_pages=gov_pages)
-
+def resolve_item_urls(items, cache, ua: str, timeout_sec: int, retries: int, backoff_sec: float, breaker=None, workers: int = 0):
+    """items의 Google News 링크를 원문 URL로 해석해 url_canonical에 넣습니다(url은 원래 링크 유지).
+    해석 요청의 429 / 타임아웃이 같은 호스트의 Google News 피드를 막지 않도록 브레이커 키는 '<호스트>#resolve'.
+    """
+    get = lambda u: http_get(u, ua=ua, timeout_sec=timeout_sec, retries=retries, backoff_sec=backoff_sec, breaker=breaker,
+                             breaker_scope="resolve")
+    finals = resolve_urls((it["url"] for it in items), cache, get, workers=workers or DEFAULTS["per_host_limit"])
     for it in items:
+        final = finals.get(it["url"])
+        if final:
+            it["url_canonical"] = canonicalize_url(final)
+    return items
+
+def resolve_stream(items, cache, titlehash_set, ua: str, timeout_sec: int, retries: int, backoff_sec: float, breaker=None,
+                   metrics=None, chunk: int = STREAM_CHUNK):
+    """resolve 단계(생성기): chunk개씩, 제목이 아직 없는 항목만 원문 URL 해석(캐시 미스만 네트워크)."""
+    metrics = metrics if metrics is not None else RunMetrics()
+    for part in chunked(items, chunk):
+        fresh = [it for it in part if sha256_hex(normalize_ws(it["title"]).lower()) not in titlehash_set]
+        with metrics.stage("resolve"):
+            resolve_item_urls(fresh, cache, ua, timeout_sec, retries, backoff_sec, breaker=breaker)
+        yield from part
+
+# ----------------------------
+# 중복 제거
+# ----------------------------
+def _dedup_chunk(items, url_set, titlehash_set, recent_sim, max_hamming: int, metrics):
+    rows = []
+    sims = simhash64_batch([it["title"] for it in items])
+    for it, sh_str in zip(items, sims):
         title_hash = sha256_hex(normalize_ws(it["title"]).lower())
 
-        if it["url_canonical"] in url_set:
-            continue
-        if title_hash in titlehash_set:
+        if it["url_canonical"] in url_set or title_hash in titlehash_set:
+            metrics.incr(it["source"], "deduped")
             continue
 
-        sh_str = simhash64(it["title"])
         dup_of = ""
         if sh_str.isdigit():
             dup_of = find_near_duplicate(int(sh_str), recent_sim, max_hamming)
+        if dup_of:
+            metrics.incr(it["source"], "near_dup")
 
-        # ✅ summary 컬럼 없음(9열)
-        row = [
+        url_set.add(it["url_canonical"])
+        titlehash_set.add(title_hash)
+        if sh_str.isdigit():
+            # capacity(recent_sim_n)를 넘으면 가장 오래된 항목이 자동 제거됨
+            recent_sim.add(int(sh_str), it["url"])
+        metrics.incr(it["source"], "inserted")
+
+        # ✅ summary 컬럼 없음(10열, ingested_at은 BatchSink가 저장 직전에 채움)
+        rows.append([
             it["published_at"],
             it["source"],
             it["title"],
@@ -325,34 +468,151 @@ def main():
             title_hash,
             sh_str,
             dup_of,
-        ]
-        new_rows.append(row)
-        inserted += 1
+            "",
+        ])
+    return rows
+
+def dedup_items(items, url_set, titlehash_set, recent_sim, max_hamming: int, metrics=None, chunk: int = STREAM_CHUNK):
+    """dedup 단계: 새 항목만 NEWS 10열 행으로 내보냅니다(생성기, SimHash는 chunk개씩 일괄 계산).
+    - url_canonical / title_hash가 이미 있으면 제외, SimHash 근접 중복은 duplicate_of에 기록
+    - 내보낸 행은 바로 인덱스(url_set / titlehash_set / recent_sim)에 반영
+    """
+    metrics = metrics if metrics is not None else RunMetrics()
+    for part in chunked(items, chunk):
+        t0 = time.perf_counter()
+        rows = _dedup_chunk(part, url_set, titlehash_set, recent_sim, max_hamming, metrics)
+        metrics.add_time("dedup", time.perf_counter() - t0)
+        yield from rows
 
-        url_set.add(it["url_canonical"])
-        titlehash_set.add(title_hash)
-        if sh_str.isdigit():
-            recent_sim.append((int(sh_str), it["url"]))
-            if len(recent_sim) > recent_sim_n:
-                recent_sim = recent_sim[-recent_sim_n:]
-
-        time.sleep(0.12)
+# ----------------------------
+# 메인
+# ----------------------------
+def load_settings(storage) -> dict:
+    """META 설정값(없으면 DEFAULTS). gov_pages가 비어 있으면 기본값을 META에 기록."""
+    rss_enabled_raw = storage.get_meta("rss_enabled")
+    if storage.get_meta("gov_pages") == "":
+        storage.set_meta("gov_pages", str(DEFAULTS.get("gov_pages", 1)))
+    return {
+        "max_hamming": int(storage.get_meta("max_hamming") or DEFAULTS["max_hamming"]),
+        "recent_sim_n": int(storage.get_meta("recent_sim_n") or DEFAULTS["recent_sim_n"]),
+        "fetch_timeout_sec": int(storage.get_meta("fetch_timeout_sec") or DEFAULTS["fetch_timeout_sec"]),
+        "rss_enabled": DEFAULTS["rss_enabled"] if rss_enabled_raw == "" else (rss_enabled_raw.strip().upper() == "TRUE"),
+        "ua": DEFAULTS["user_agent"],
+        "retries": int(DEFAULTS.get("http_retries", 2)),
+        "backoff": float(DEFAULTS.get("http_backoff_sec", 1.2)),
+        "fetch_workers": int(storage.get_meta("fetch_workers") or DEFAULTS["fetch_workers"]),
+        "per_host_limit": int(storage.get_meta("per_host_limit") or DEFAULTS["per_host_limit"]),
+        "gov_pages": int(storage.get_meta("gov_pages") or DEFAULTS.get("gov_pages", 1)),
+        "gov_max_pages": int(storage.get_meta("gov_max_pages") or DEFAULTS["gov_max_pages"]),
+        "sink_batch_rows": int(storage.get_meta("sink_batch_rows") or DEFAULTS["sink_batch_rows"]),
+        "sink_batch_sec": float(storage.get_meta("sink_batch_sec") or DEFAULTS["sink_batch_sec"]),
+    }
 
-    if new_rows:
-        ws_news.append_rows(new_rows, value_input_option="RAW")
+def _profile_path(storage) -> str:
+    """NEWS_PROFILE=1 또는 META profile_next_run=TRUE이면 이번 실행을 cProfile로 저장(META 플래그는 1회용)."""
+    flag = os.getenv("NEWS_PROFILE", "").strip() == "1"
+    if storage.get_meta("profile_next_run").strip().upper() == "TRUE":
+        storage.set_meta("profile_next_run", "FALSE")
+        flag = True
+    if not flag:
+        return ""
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    return os.path.join(cache_dir(), "profiles", f"run-{stamp}.prof")
 
-    meta_set(ws_meta, "last_inserted_count", str(inserted))
+def _write_metrics(metrics, storage):
+    # 실행 로그(JSON Lines)는 항상, METRICS 요약은 append 1회(실패해도 실행 결과에는 영향 없음)
+    metrics.write_jsonl(os.path.join(cache_dir(), "runs.jsonl"))
+    try:
+        storage.append_metrics(metrics.sheet_rows())
+    except Exception as e:
+        print(f"metrics write failed: {type(e).__name__}: {e}")
 
-if __name__ == "__main__":
+def main():
+    # NEWS_STORAGE=sheets(기본, META는 한 번 읽고 쓰기는 모아서 flush) | local(SQLite)
+    storage = open_storage()
+    metrics = RunMetrics()
     try:
-        main()
+        with profiled(_profile_path(storage)):
+            _run(storage, metrics)
     except Exception as e:
         # META에 에러 기록
-        try:
-            sh = open_sheet()
-            _, ws_meta = ensure_tabs(sh)
-            meta_set(ws_meta, "last_error", repr(e))
-            meta_set(ws_meta, "last_run_at", datetime.now(timezone.utc).isoformat())
-        except Exception:
-            pass
+        storage.set_meta("last_error", repr(e))
+        storage.set_meta("last_run_at", datetime.now(timezone.utc).isoformat())
+        metrics.set("error", repr(e))
         raise
+    finally:
+        storage.flush()
+        _write_metrics(metrics, storage)
+        storage.close()
+
+def _run(storage, metrics=None):
+    metrics = metrics if metrics is not None else RunMetrics()
+    # META 설정값 읽기(없으면 기본값)
+    cfg = load_settings(storage)
+    max_hamming, recent_sim_n, fetch_timeout_sec = cfg["max_hamming"], cfg["recent_sim_n"], cfg["fetch_timeout_sec"]
+    ua, retries, backoff = cfg["ua"], cfg["retries"], cfg["backoff"]
+    fetch_workers = cfg["fetch_workers"]
+    configure_fetch_limits(fetch_workers, cfg["per_host_limit"])
+
+    storage.set_meta("last_run_at", datetime.now(timezone.utc).isoformat())
+    storage.set_meta("last_error", "")
+
+    if not cfg["rss_enabled"]:
+        storage.set_meta("last_inserted_count", "0")
+        return
+
+    store = DedupStore(os.path.join(cache_dir(), "dedup.sqlite3"))
+    with metrics.stage("load_indexes"):
+        url_set, titlehash_set, recent_sim = load_indexes(storage, recent_sim_n, max_hamming, store=store, meta=storage)
+
+    # RSS(전문지) + HTML 크롤링(정부)을 단계별 생성기로 연결:
+    # fetch → parse → tag(소스별 스레드) → resolve(원문 URL) → dedup → BatchSink(N행/T초마다 저장)
+    gov_pages, gov_max_pages = cfg["gov_pages"], cfg["gov_max_pages"]
+    http_cache = ValidatorCache(os.path.join(cache_dir(), "http_validators.json"))
+    breaker = CircuitBreaker(os.path.join(cache_dir(), "circuit.json"))
+    redirects = RedirectCache(os.path.join(cache_dir(), "redirects.json")) if DEFAULTS["resolve_redirects"] else None
+
+    def on_flush(rows):
+        store.append(rows)
+        store.save_watermark(storage)
+
+    sink = BatchSink(storage, cfg["sink_batch_rows"], cfg["sink_batch_sec"], on_flush=on_flush, metrics=metrics)
+    try:
+        with metrics.stage("pipeline"):
+            items = iter_collect(ua=ua, timeout_sec=fetch_timeout_sec, retries=retries, backoff_sec=backoff, gov_pages=gov_pages,
+                                 workers=fetch_workers, cache=http_cache, breaker=breaker, known=url_set, gov_max_pages=gov_max_pages,
+                                 metrics=metrics)
+            # 제목이 이미 있는 항목은 어차피 걸러지므로 새 항목만 원문 URL 해석
+            if redirects is not None:
+                items = resolve_stream(items, redirects, titlehash_set, ua, fetch_timeout_sec, retries, backoff,
+                                       breaker=breaker, metrics=metrics)
+            for row in dedup_items(items, url_set, titlehash_set, recent_sim, max_hamming, metrics):
+                sink.add(row)
+    finally:
+        # 중간에 실패해도 모인 행까지 저장(다음 실행은 저장된 행을 중복으로 걸러 냄)
+        try:
+            sink.close()
+        finally:
+            store.close()
+            breaker.save()
+            if redirects is not None:
+                redirects.save()
+            storage.set_meta("last_inserted_count", str(sink.written))
+            metrics.set("inserted", sink.written)
+    if breaker.open_hosts():
+        print(f"circuit open(skipped): {', '.join(breaker.open_hosts())}")
+
+    # 모든 행을 저장한 뒤에만 검증자를 저장(중간 실패 시 다음 실행에서 다시 받음)
+    http_cache.save()
+    if redirects is not None:
+        print(f"redirects: {redirects.stats}")
+    print(f"http cache: {http_cache.summary()}")
+    print(f"parse: {PARSE_STATS.counts}")
+    print(f"inserted: {sink.written} rows in {sink.batches} batches")
+    storage.set_meta("last_parse_stats", json.dumps(PARSE_STATS.counts))
+    storage.set_meta("last_http_cache", http_cache.summary())
+    metrics.set("parse", dict(PARSE_STATS.counts))
+    metrics.set("http_cache", http_cache.summary())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# hismedi-app/news/search.py
+# -*- coding: utf-8 -*-
+"""대시보드 키워드 검색용 문자 n-gram 역색인(형태소 분석기 없이 한국어 부분일치).
+
+- 행마다 title / source / tags를 소문자로 이어 붙인 문자열에서 글자(1-gram)와 2-gram을 색인
+- 검색어는 공백으로 나눈 AND 조건, 각 단어는 '부분일치'(str.contains(regex=False)와 같은 결과)
+  · 1~2글자: 색인 목록이 곧 정답
+  · 3글자 이상: 2-gram 목록을 교집합해 후보를 줄인 뒤 실제 부분일치로 확인
+- 결과는 정렬된 행 위치(np.ndarray) → 날짜/태그 필터 결과와 np.isin 등으로 바로 결합
+"""
+
+from array import array
+from collections import defaultdict
+
+import numpy as np
+
+SEARCH_COLUMNS = ("title", "source", "tags")
+_EMPTY = np.empty(0, dtype=np.int32)
+
+
+def _grams(text: str):
+    return set(text) | {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+class NgramIndex:
+    def __init__(self, texts):
+        self._texts = [str(t or "").lower() for t in texts]
+        post = defaultdict(lambda: array("i"))
+        for i, t in enumerate(self._texts):
+            for g in _grams(t):
+                post[g].append(i)
+        self._post = {g: np.frombuffer(a, dtype=np.int32) for g, a in post.items()}
+
+    @classmethod
+    def from_frame(cls, df, columns=SEARCH_COLUMNS):
+        """DataFrame 행 순서(위치) 그대로 색인. 열 경계를 넘는 일치가 없도록 줄바꿈으로 구분."""
+        cols = [c for c in columns if c in df.columns]
+        if not cols:
+            return cls([""] * len(df))
+        joined = df[cols[0]].astype(object).fillna("").astype(str)
+        for c in cols[1:]:
+            joined = joined + "\n" + df[c].astype(object).fillna("").astype(str)
+        return cls(joined.tolist())
+
+    def __len__(self):
+        return len(self._texts)
+
+    def search_term(self, term: str) -> np.ndarray:
+        term = (term or "").lower()
+        if not term:
+            return np.arange(len(self._texts), dtype=np.int32)
+        grams = [term] if len(term) <= 2 else sorted({term[i:i + 2] for i in range(len(term) - 1)},
+                                                     key=lambda g: len(self._post.get(g, _EMPTY)))
+        cand = self._post.get(grams[0], _EMPTY)
+        for g in grams[1:]:
+            if not len(cand):
+                break
+            cand = np.intersect1d(cand, self._post.get(g, _EMPTY), assume_unique=True)
+        if len(term) <= 2:
+            return cand
+        texts = self._texts
+        return np.fromiter((i for i in cand if term in texts[i]), dtype=np.int32)
+
+    def search(self, query: str):
+        """공백으로 나눈 모든 단어를 포함하는 행 위치(정렬). 검색어가 비어 있으면 None."""
+        terms = sorted(set((query or "").lower().split()), key=len, reverse=True)
+        if not terms:
+            return None
+        hits = None
+        for term in terms:
+            found = self.search_term(term)
+            hits = found if hits is None else np.intersect1d(hits, found, assume_unique=True)
+            if not len(hits):
+                break
+        return hits
@@ -0,0 +1,107 @@
+# hismedi-app/news/simindex.py
+# -*- coding: utf-8 -*-
+"""SimHash 근접 중복 검색용 다중 블록 인덱스.
+
+64비트 해시를 blocks개의 연속 비트 블록으로 나누면, 해밍 거리 ≤ k 인 두 해시는
+(비둘기집 원리로) 최소 r = blocks - k 개의 블록이 정확히 같습니다.
+r개 블록 조합마다 해시 테이블을 두고, 조회 시 각 테이블 버킷의 후보만 해밍 거리를 검사합니다.
+
+- 기본값 blocks = k + 2 (k=6 → 8블록 × 8비트, 2블록 조합 28개 테이블, 키 16비트)
+  → 후보 수 ≈ 28 · n / 65536 (수십만 건에서도 수백 건 이하)
+- 삽입 순서(seq)를 유지해 여러 건이 걸리면 가장 오래된 항목을 반환 → 선형 스캔과 같은 답
+- capacity를 넘으면 가장 오래된 항목부터 제거(기존 recent_sim 슬라이딩 윈도우와 동일)
+"""
+
+from collections import deque
+from itertools import combinations
+
+
+class SimHashIndex:
+    def __init__(self, max_hamming: int = 6, capacity: int = 0, blocks: int = 0):
+        self.max_hamming = max(0, int(max_hamming))
+        blocks = int(blocks or self.max_hamming + 2)
+        blocks = min(64, max(blocks, self.max_hamming + 1))
+        self.capacity = max(0, int(capacity))  # 0 = 제한 없음
+
+        # 64비트를 blocks개로 최대한 고르게 분할한 블록 마스크
+        base, extra = divmod(64, blocks)
+        block_masks = []
+        shift = 0
+        for b in range(blocks):
+            width = base + (1 if b < extra else 0)
+            block_masks.append(((1 << width) - 1) << shift)
+            shift += width
+
+        # r개 블록 조합 = 테이블 하나, 키는 해당 블록 비트만 남긴 값(sim & mask)
+        r = blocks - self.max_hamming
+        self._masks = []
+        for combo in combinations(range(blocks), r):
+            m = 0
+            for b in combo:
+                m |= block_masks[b]
+            self._masks.append(m)
+        self._tables = [dict() for _ in self._masks]
+        self._entries = {}       # seq → (sim, url)
+        self._order = deque()    # 삽입 순서의 seq
+        self._next_seq = 0
+
+    def _keys(self, sim: int):
+        return [sim & m for m in self._masks]
+
+    def add(self, sim: int, url: str = ""):
+        seq = self._next_seq
+        self._next_seq += 1
+        self._entries[seq] = (sim, url)
+        self._order.append(seq)
+        for table, key in zip(self._tables, self._keys(sim)):
+            bucket = table.get(key)
+            if bucket is None:
+                table[key] = [seq]
+            else:
+                bucket.append(seq)
+        if self.capacity and len(self._order) > self.capacity:
+            self.evict_oldest()
+
+    def evict_oldest(self):
+        if not self._order:
+            return
+        seq = self._order.popleft()
+        sim, _ = self._entries.pop(seq)
+        for table, key in zip(self._tables, self._keys(sim)):
+            bucket = table[key]
+            # 가장 오래된 항목이므로 거의 항상 맨 앞
+            if bucket[0] == seq:
+                bucket.pop(0)
+            else:
+                bucket.remove(seq)
+            if not bucket:
+                del table[key]
+
+    def find(self, sim: int, max_hamming: int = -1) -> str:
+        """해밍 거리 ≤ max_hamming 인 가장 오래된 항목의 url(없으면 '')."""
+        k = self.max_hamming if max_hamming < 0 else max_hamming
+        if k > self.max_hamming:
+            # 인덱스가 보장하는 범위를 넘으면 선형 스캔
+            for s, url in self:
+                if (sim ^ s).bit_count() <= k:
+                    return url
+            return ""
+
+        best = None
+        seen = set()
+        for table, key in zip(self._tables, self._keys(sim)):
+            for seq in table.get(key, ()):
+                if seq in seen or (best is not None and seq >= best):
+                    continue
+                seen.add(seq)
+                if (sim ^ self._entries[seq][0]).bit_count() <= k:
+                    best = seq
+        return self._entries[best][1] if best is not None else ""
+
+    def __len__(self):
+        return len(self._order)
+
+    def __iter__(self):
+        """삽입 순서대로 (sim, url)."""
+        for seq in self._order:
+            yield self._entries[seq]
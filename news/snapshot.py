@@ -0,0 +1,134 @@
+# hismedi-app/news/snapshot.py
+# -*- coding: utf-8 -*-
+"""news_app 대시보드용 news 탭 로컬 스냅샷(Parquet, 열 타입 고정).
+
+get_all_records로 시트 전체를 매번 읽는 대신:
+- 스냅샷 = 시트 행 순서 그대로의 DataFrame + 'published_kst'(KST naive datetime) 열,
+  source / tags는 category 타입으로 저장
+- refresh(): 마지막으로 알고 있는 행부터만 읽어(저장소 read_rows 1회, 시트면 batch_get 1회) 새 행을 이어 붙임
+  마지막 행의 url이 달라졌거나(시트 수정/삭제) 행 수가 줄었으면 전체를 다시 읽음
+- max_age_sec 안에 다시 호출하면 시트를 읽지 않고 그대로 반환
+- version: 내용이 바뀔 때마다 1씩 증가(화면 쪽 메모이제이션 키)
+"""
+
+import os, json, time, threading
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+PUB_COLUMNS = ["published_at", "publishedAt", "pubDate", "date", "발행"]
+CATEGORY_COLUMNS = ("source", "tags")
+PUB_KST = "published_kst"
+
+
+def to_kst(series: pd.Series) -> pd.Series:
+    """여러 형식의 발행일 → KST naive datetime(해석 불가 값은 NaT)."""
+    # 스크레이퍼가 쓰는 ISO 형식은 빠른 경로로, 나머지만 요소별로 해석
+    dt = pd.to_datetime(series, errors="coerce", utc=True, format="ISO8601")
+    miss = dt.isna() & series.fillna("").astype(str).str.strip().ne("")
+    if miss.any():
+        dt[miss] = pd.to_datetime(series[miss], errors="coerce", utc=True, format="mixed")
+    return dt.dt.tz_convert("Asia/Seoul").dt.tz_localize(None)
+
+def _frame(header, rows) -> pd.DataFrame:
+    width = len(header)
+    rows = [(list(r) + [""] * width)[:width] for r in rows]
+    df = pd.DataFrame(rows, columns=header, dtype=object)
+    pub_col = next((c for c in PUB_COLUMNS if c in df.columns), None)
+    df[PUB_KST] = to_kst(df[pub_col]) if pub_col else pd.Series(pd.NaT, index=df.index, dtype="datetime64[ns]")
+    for c in CATEGORY_COLUMNS:
+        if c in df.columns:
+            df[c] = df[c].astype("category")
+    return df
+
+def _concat(old: pd.DataFrame, new: pd.DataFrame) -> pd.DataFrame:
+    if old.empty:
+        return new
+    if new.empty:
+        return old
+    cats = {c: union_categoricals([old[c], new[c]], ignore_order=True) for c in CATEGORY_COLUMNS if c in old.columns}
+    out = pd.concat([old.astype({c: object for c in cats}), new.astype({c: object for c in cats})], ignore_index=True)
+    for c, u in cats.items():
+        out[c] = pd.Categorical(out[c], categories=u.categories)
+    return out
+
+
+class NewsSnapshot:
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._refreshed_at = 0.0
+        self.stats = {"full": 0, "delta": 0, "rows_read": 0}
+        self._header = []
+        self.version = 0
+        self.df = self._load()
+
+    @property
+    def _meta_path(self) -> str:
+        return self.path + ".json"
+
+    def _load(self) -> pd.DataFrame:
+        try:
+            with open(self._meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            df = pd.read_parquet(self.path)
+        except (OSError, ValueError):
+            return pd.DataFrame()
+        self._header = meta.get("header") or []
+        return df if list(df.columns[: len(self._header)]) == self._header else pd.DataFrame()
+
+    def _save(self):
+        d = os.path.dirname(self.path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        tmp = self.path + ".tmp"
+        self.df.to_parquet(tmp, index=False)
+        os.replace(tmp, self.path)
+        with open(self._meta_path, "w", encoding="utf-8") as f:
+            json.dump({"header": self._header, "rows": len(self.df)}, f, ensure_ascii=False)
+
+    def _full(self, storage):
+        header, rows = storage.read_rows(1)
+        self._header = header
+        self.df = _frame(header, rows) if header else pd.DataFrame()
+        self.stats["full"] += 1
+        self.stats["rows_read"] += len(rows)
+
+    def _delta(self, storage) -> bool:
+        """마지막으로 알고 있는 행(데이터 n행)부터 읽어 이어 붙임. 검증 실패 시 False."""
+        n = len(self.df)
+        header, tail = storage.read_rows(n)
+        if header != self._header or not tail:
+            return False
+        width = len(header)
+        last = (list(tail[0]) + [""] * width)[:width]
+        known = self.df.iloc[-1]
+        key = "url" if "url" in header else header[0]
+        if str(last[header.index(key)]) != str(known[key]):
+            return False
+        new = tail[1:]
+        if new:
+            self.df = _concat(self.df, _frame(header, new))
+        self.stats["delta"] += 1
+        self.stats["rows_read"] += len(new)
+        return True
+
+    def refresh(self, get_storage, max_age_sec: float = 0):
+        """get_storage() → news.storage 저장소(필요할 때만 호출). (df, version)을 반환합니다.
+        - 둘은 잠금 안에서 함께 읽은 쌍이므로 version별 메모 캐시 키로는 이 쌍만 쓰세요
+          (self.version을 따로 읽으면 다른 세션의 갱신과 섞일 수 있음).
+        - 반환 DataFrame은 읽기 전용으로 쓰세요.
+        """
+        with self._lock:
+            if max_age_sec and time.monotonic() - self._refreshed_at < max_age_sec and not self.df.empty:
+                return self.df, self.version
+            storage = get_storage()
+            before = len(self.df)
+            if self.df.empty or not self._delta(storage):
+                self._full(storage)
+                before = -1
+            if len(self.df) != before:
+                self.version += 1
+                self._save()
+            self._refreshed_at = time.monotonic()
+            return self.df, self.version
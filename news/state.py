@@ -0,0 +1,180 @@
+# hismedi-app/news/state.py
+# -*- coding: utf-8 -*-
+"""로컬 중복 제거 상태 저장소(SQLite).
+
+NEWS 탭의 url / url_canonical / title_hash / simhash 를 행 번호와 함께 보관합니다.
+- 매 실행 get_all_values()로 전체 시트를 받는 대신, META 워터마크(news_row_watermark)
+  이후에 추가된 행(tail)만 필요한 열(D, E, G, H)로 범위 읽기해 반영합니다
+  (원본은 news.storage 저장소의 index_rows — 시트 또는 로컬 SQLite).
+- 워터마크가 스냅샷과 다르거나 마지막 행이 시트와 다르면(삭제/정렬/수동 편집)
+  필요한 열만 전체를 다시 읽어 재구성합니다.
+- url_canonical / title_hash 조회는 인덱스 쿼리(O(1))이며, 앞단에 메모리 매핑된
+  64비트 지문 집합(news.fingerprint)을 두어 대부분의 '없음'은 쿼리 없이 판정합니다.
+- 게시판 크롤러가 수집 스레드에서 조회하므로 연결은 스레드 간 공유(잠금으로 직렬화)합니다.
+"""
+
+import os, sqlite3, threading
+
+from news.gsheet import meta_get, meta_set, NEWS_WATERMARK_KEY
+from news.fingerprint import FingerprintSet
+
+# NEWS_HEADERS 기준 열 위치(0부터): D=url, E=url_canonical, G=title_hash, H=simhash
+_COL_URL, _COL_URL_C, _COL_TITLE_HASH, _COL_SIMHASH = 3, 4, 6, 7
+
+
+def _cell(row, i):
+    return row[i] if len(row) > i else ""
+
+
+class DedupStore:
+    def __init__(self, path: str):
+        self.path = path
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS news (
+                row_no INTEGER PRIMARY KEY,   -- 데이터 행 번호(헤더 제외, 1부터)
+                url TEXT,
+                url_canonical TEXT,
+                title_hash TEXT,
+                simhash TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_news_url_c ON news(url_canonical);
+            CREATE INDEX IF NOT EXISTS idx_news_title_hash ON news(title_hash);
+            -- 지문 파일(.npy)에 반영된 행 수
+            CREATE TABLE IF NOT EXISTS fp_state (col TEXT PRIMARY KEY, row_count INTEGER);
+        """)
+
+    # ----------------------------
+    # 조회
+    # ----------------------------
+    def row_count(self) -> int:
+        return self.conn.execute("SELECT COALESCE(MAX(row_no), 0) FROM news").fetchone()[0]
+
+    def has_url(self, url_c: str) -> bool:
+        with self._lock:
+            return self.conn.execute(
+                "SELECT 1 FROM news WHERE url_canonical = ? LIMIT 1", (url_c,)
+            ).fetchone() is not None
+
+    def has_title_hash(self, th: str) -> bool:
+        with self._lock:
+            return self.conn.execute(
+                "SELECT 1 FROM news WHERE title_hash = ? LIMIT 1", (th,)
+            ).fetchone() is not None
+
+    def recent_sims(self, n: int):
+        """최근 n건(0이면 전체)의 (sim_int, url), 오래된 것부터."""
+        sql = "SELECT simhash, url FROM news WHERE simhash != ''"
+        if n > 0:
+            sql += f" AND row_no > (SELECT COALESCE(MAX(row_no), 0) FROM news) - {int(n)}"
+        sql += " ORDER BY row_no"
+        return [(int(s), u) for s, u in self.conn.execute(sql) if s.isdigit()]
+
+    # ----------------------------
+    # 갱신
+    # ----------------------------
+    def _insert(self, start_row_no: int, index_rows):
+        # index_rows: (url, url_canonical, title_hash, simhash) 순서
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO news(row_no, url, url_canonical, title_hash, simhash) VALUES (?,?,?,?,?)",
+                [(start_row_no + i, *r) for i, r in enumerate(index_rows)],
+            )
+
+    def append(self, rows, start_row_no: int = 0):
+        """NEWS 행들을 row_no 순서대로 추가(start_row_no 생략 시 현재 마지막 행 다음)."""
+        start = start_row_no or self.row_count() + 1
+        self._insert(start, [
+            (_cell(r, _COL_URL), _cell(r, _COL_URL_C), _cell(r, _COL_TITLE_HASH), _cell(r, _COL_SIMHASH))
+            for r in rows
+        ])
+
+    def sync(self, storage, meta=None) -> int:
+        """저장소(news.storage)의 NEWS와 맞춥니다. 새로 반영한 행 수를 반환합니다.
+        - META 워터마크 == 저장 행 수(n)이면 시트 n+1행(마지막으로 아는 행)부터 D,E,G,H만 읽고,
+          첫 행이 저장된 값과 같으면 나머지(tail)만 추가
+        - 아니면 D,E,G,H 전체를 읽어 재구성
+        - meta(MetaSession/워크시트)를 주면 워터마크를 갱신합니다.
+        """
+        n = self.row_count()
+        wm = int(meta_get(meta, NEWS_WATERMARK_KEY) or 0) if meta is not None else n
+        added = -1
+        if n > 0 and wm == n:
+            rows = storage.index_rows(n)
+            stored = self.conn.execute(
+                "SELECT url, title_hash FROM news WHERE row_no = ?", (n,)
+            ).fetchone()
+            if rows and (rows[0][0], rows[0][2]) == stored:
+                self._insert(n + 1, rows[1:])
+                added = len(rows) - 1
+
+        if added < 0:
+            rows = storage.index_rows(1)
+            with self._lock, self.conn:
+                self.conn.execute("DELETE FROM news")
+                self.conn.execute("DELETE FROM fp_state")
+            self._insert(1, rows)
+            added = len(rows)
+
+        self.save_watermark(meta)
+        return added
+
+    def fingerprint_set(self, column: str) -> FingerprintSet:
+        """column(url_canonical/title_hash)의 지문 집합을 메모리 매핑으로 엽니다.
+        - 저장된 .npy 이후에 추가된 행만 합쳐 다시 저장(재구성 시에는 전체 생성)
+        """
+        if column not in ("url_canonical", "title_hash"):
+            raise ValueError(f"unsupported column: {column}")
+        path = f"{self.path}.{column}.fp.npy"
+        n = self.row_count()
+        done = self.conn.execute("SELECT row_count FROM fp_state WHERE col = ?", (column,)).fetchone()
+        done = done[0] if done else 0
+        if done == n and n and os.path.exists(path):
+            return FingerprintSet.load(path)
+
+        if done and done < n and os.path.exists(path):
+            fs = FingerprintSet.load(path)
+            fs.update(r[0] for r in self.conn.execute(f"SELECT {column} FROM news WHERE row_no > ?", (done,)))
+        else:
+            fs = FingerprintSet.from_keys(r[0] for r in self.conn.execute(f"SELECT {column} FROM news"))
+        fs.save(path)
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO fp_state(col, row_count) VALUES (?, ?)", (column, n))
+        return FingerprintSet.load(path)
+
+    def save_watermark(self, meta):
+        if meta is not None:
+            meta_set(meta, NEWS_WATERMARK_KEY, str(self.row_count()))
+
+    def close(self):
+        self.conn.close()
+
+
+class StoreKeySet:
+    """DedupStore 열을 set처럼 쓰기 위한 얇은 래퍼(이번 실행에서 추가한 키는 메모리에 보관).
+    - prefilter(FingerprintSet)에 없으면 바로 False, 있으면 lookup(SQL)으로 정확히 재확인
+    """
+
+    def __init__(self, lookup, prefilter=None):
+        self._lookup = lookup
+        self._prefilter = prefilter
+        self._pending = set()
+
+    def __contains__(self, key) -> bool:
+        if key in self._pending:
+            return True
+        if self._prefilter is not None and key not in self._prefilter:
+            return False
+        return self._lookup(key)
+
+    def contains_many(self, keys):
+        keys = list(keys)
+        maybe = self._prefilter.contains_many(keys) if self._prefilter is not None else [True] * len(keys)
+        return [k in self._pending or (m and self._lookup(k)) for k, m in zip(keys, maybe)]
+
+    def add(self, key):
+        self._pending.add(key)
@@ -0,0 +1,331 @@
+# hismedi-app/news/storage.py
+# -*- coding: utf-8 -*-
+"""NEWS/META 저장소 추상화.
+
+- SheetStorage: 기존 Google Sheets(NEWS/META/METRICS 탭). META는 MetaSession으로 모아 쓰기
+- LocalStorage: 로컬 SQLite 파일 하나(news/meta/metrics/articles 테이블)
+  append_rows는 트랜잭션 1회(executemany), 조회는 디스크 속도 — 시트 쿼터 없이 한 대에서
+  스크레이퍼 / reader / 대시보드(Parquet 스냅샷)를 모두 돌리거나 오프라인 테스트할 때 사용
+공통 메서드: append_rows / read_rows / iter_rows / index_rows / row_count / get_meta / set_meta /
+append_metrics / flush / close. 행 번호(start_row)는 헤더를 제외한 데이터 행 기준(1부터)입니다.
+BatchSink: 행을 모아 N행 또는 T초마다 append_rows 1회(스크레이퍼 / 상주 모드의 마지막 단계)
+선택: NEWS_STORAGE=sheets(기본) | local, NEWS_LOCAL_DB(기본 <캐시 폴더>/news.sqlite3)
+"""
+
+import os, time, sqlite3, threading
+from collections import namedtuple
+
+from datetime import datetime, timezone
+
+from news.config import DEFAULTS
+from news.gsheet import (
+    NEWS_HEADERS, METRICS_HEADERS, MetaSession, open_sheet, ensure_tabs, ensure_metrics_tab, read_news_columns,
+)
+
+# 중복 제거 인덱스에 쓰는 열(DedupStore / load_indexes 순서)
+INDEX_FIELDS = ("url", "url_canonical", "title_hash", "simhash")
+_LAST_COL = "ZZ"
+# BatchSink가 저장 직전에 채우는 추가 시각 열
+_INGESTED_I = NEWS_HEADERS.index("ingested_at")
+# reader 입력 행(BigQuery Row처럼 .url / .fetch_url)
+PendingArticle = namedtuple("PendingArticle", ["url", "fetch_url"])
+
+
+def _letter(i: int) -> str:
+    s = ""
+    i += 1
+    while i:
+        i, r = divmod(i - 1, 26)
+        s = chr(65 + r) + s
+    return s
+
+
+class NewsStorage:
+    """백엔드 공통 인터페이스. read_rows / append_rows / get_meta / set_meta는 백엔드가 구현."""
+
+    def read_rows(self, start_row: int = 1, columns=None):
+        """(header, rows): start_row번째 데이터 행부터 끝까지. columns(열 이름)를 주면 그 열만."""
+        raise NotImplementedError
+
+    def append_rows(self, rows) -> int:
+        raise NotImplementedError
+
+    def get_meta(self, key: str) -> str:
+        raise NotImplementedError
+
+    def set_meta(self, key: str, value: str):
+        raise NotImplementedError
+
+    def iter_rows(self, start_row: int = 1, columns=None):
+        yield from self.read_rows(start_row, columns)[1]
+
+    def index_rows(self, start_row: int = 1):
+        """(url, url_canonical, title_hash, simhash) 행들."""
+        return self.read_rows(start_row, INDEX_FIELDS)[1]
+
+    def row_count(self) -> int:
+        return len(self.read_rows(1, ("url",))[1])
+
+    def append_metrics(self, rows):
+        pass
+
+    def reload_meta(self):
+        """META를 다시 읽음(읽기 캐시가 있는 백엔드만)."""
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ----------------------------
+# Google Sheets
+# ----------------------------
+class SheetStorage(NewsStorage):
+    """ws_meta가 없으면(대시보드처럼 NEWS만 읽는 경우) META는 빈 값."""
+
+    def __init__(self, ws_news, ws_meta=None, sh=None):
+        self.ws_news = ws_news
+        self.meta = MetaSession(ws_meta) if ws_meta is not None else None
+        self._sh = sh
+
+    @classmethod
+    def open(cls):
+        sh = open_sheet()
+        ws_news, ws_meta = ensure_tabs(sh)
+        return cls(ws_news, ws_meta, sh=sh)
+
+    def read_rows(self, start_row: int = 1, columns=None):
+        if columns:
+            # NEWS_HEADERS 고정 열 위치(D, E, G, H 등)만 범위 읽기
+            letters = [_letter(NEWS_HEADERS.index(c)) for c in columns]
+            return list(columns), read_news_columns(self.ws_news, start_row + 1, letters)
+        # 헤더 + 꼬리를 batch_get 1회로
+        head, tail = self.ws_news.batch_get([f"A1:{_LAST_COL}1", f"A{start_row + 1}:{_LAST_COL}"])
+        return [str(c).strip() for c in (head[0] if head else [])], [list(r) for r in tail]
+
+    def append_rows(self, rows) -> int:
+        rows = [list(r) for r in rows]
+        if rows:
+            self.ws_news.append_rows(rows, value_input_option="RAW")
+        return len(rows)
+
+    def get_meta(self, key: str) -> str:
+        return self.meta.get(key) if self.meta is not None else ""
+
+    def set_meta(self, key: str, value: str):
+        if self.meta is None:
+            raise RuntimeError("META worksheet not opened")
+        self.meta.set(key, value)
+
+    def append_metrics(self, rows):
+        if rows and self._sh is not None:
+            ensure_metrics_tab(self._sh).append_rows(rows, value_input_option="RAW")
+
+    def reload_meta(self):
+        if self.meta is not None:
+            self.meta.reload()
+
+    def flush(self):
+        if self.meta is not None:
+            self.meta.flush()
+
+
+# ----------------------------
+# 로컬 SQLite
+# ----------------------------
+class LocalStorage(NewsStorage):
+    """news(row_no + NEWS_HEADERS 열) / meta / metrics / articles(url, article_text)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        cols = ", ".join(f"{c} TEXT NOT NULL DEFAULT ''" for c in NEWS_HEADERS)
+        mcols = ", ".join(f"{c} TEXT" for c in METRICS_HEADERS)
+        self.conn.executescript(f"""
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = NORMAL;
+            CREATE TABLE IF NOT EXISTS news (row_no INTEGER PRIMARY KEY, {cols});
+            CREATE INDEX IF NOT EXISTS idx_news_url_c ON news(url_canonical);
+            CREATE INDEX IF NOT EXISTS idx_news_title_hash ON news(title_hash);
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS metrics ({mcols});
+            -- reader 본문(SqliteArticleWriter가 article_text를 채움)
+            CREATE TABLE IF NOT EXISTS articles (url TEXT PRIMARY KEY, fetch_url TEXT, article_text TEXT);
+        """)
+        # 예전 파일에 없는 열(ingested_at 등) 추가
+        have = {r[1] for r in self.conn.execute("PRAGMA table_info(news)")}
+        with self.conn:
+            for c in NEWS_HEADERS:
+                if c not in have:
+                    self.conn.execute(f"ALTER TABLE news ADD COLUMN {c} TEXT NOT NULL DEFAULT ''")
+
+    def read_rows(self, start_row: int = 1, columns=None):
+        return list(columns or NEWS_HEADERS), list(self.iter_rows(start_row, columns))
+
+    def iter_rows(self, start_row: int = 1, columns=None):
+        cols = list(columns or NEWS_HEADERS)
+        bad = [c for c in cols if c not in NEWS_HEADERS]
+        if bad:
+            raise ValueError(f"unknown columns: {bad}")
+        cur = self.conn.execute(
+            f"SELECT {', '.join(cols)} FROM news WHERE row_no >= ? ORDER BY row_no", (int(start_row),)
+        )
+        for r in cur:
+            yield list(r)
+
+    def row_count(self) -> int:
+        return self.conn.execute("SELECT COALESCE(MAX(row_no), 0) FROM news").fetchone()[0]
+
+    def append_rows(self, rows) -> int:
+        """한 트랜잭션으로 추가(중간 실패 시 전체 롤백). url은 articles에도 등록."""
+        width = len(NEWS_HEADERS)
+        rows = [tuple((list(r) + [""] * width)[:width]) for r in rows]
+        if not rows:
+            return 0
+        marks = ", ".join("?" * width)
+        with self._lock, self.conn:
+            start = self.row_count() + 1
+            self.conn.executemany(
+                f"INSERT INTO news(row_no, {', '.join(NEWS_HEADERS)}) VALUES (?, {marks})",
+                [(start + i, *r) for i, r in enumerate(rows)],
+            )
+            url_i, url_c_i = NEWS_HEADERS.index("url"), NEWS_HEADERS.index("url_canonical")
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO articles(url, fetch_url) VALUES (?, ?)",
+                [(r[url_i], r[url_c_i] or r[url_i]) for r in rows if r[url_i]],
+            )
+        return len(rows)
+
+    # ----------------------------
+    # 인덱스 조회
+    # ----------------------------
+    def has_url(self, url_c: str) -> bool:
+        return self.conn.execute("SELECT 1 FROM news WHERE url_canonical = ? LIMIT 1", (url_c,)).fetchone() is not None
+
+    def has_title_hash(self, th: str) -> bool:
+        return self.conn.execute("SELECT 1 FROM news WHERE title_hash = ? LIMIT 1", (th,)).fetchone() is not None
+
+    def pending_articles(self, limit: int, skip_urls=()):
+        """본문이 아직 없는 (url, fetch_url) — reader의 BigQuery 조회 대신."""
+        skip = set(skip_urls)
+        cur = self.conn.execute("SELECT url, fetch_url FROM articles WHERE article_text IS NULL")
+        out = []
+        for url, fetch_url in cur:
+            if url in skip:
+                continue
+            out.append(PendingArticle(url, fetch_url or url))
+            if len(out) >= limit:
+                break
+        return out
+
+    # ----------------------------
+    # META / METRICS
+    # ----------------------------
+    def get_meta(self, key: str) -> str:
+        r = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return r[0] if r else ""
+
+    def set_meta(self, key: str, value: str):
+        with self._lock, self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO meta(key, value) VALUES (?, ?)", (key, str(value)))
+
+    def append_metrics(self, rows):
+        if rows:
+            with self._lock, self.conn:
+                self.conn.executemany(
+                    f"INSERT INTO metrics VALUES ({', '.join('?' * len(METRICS_HEADERS))})",
+                    [tuple(str(v) for v in r) for r in rows],
+                )
+
+    def close(self):
+        self.conn.close()
+
+
+# ----------------------------
+# 묶음 저장
+# ----------------------------
+class BatchSink:
+    """행을 모았다가 batch_rows건이 되거나 첫 행 이후 batch_sec초가 지나면 storage.append_rows 1회.
+    - on_flush(rows): 저장 직후 호출(DedupStore 반영 등)
+    - 저장 직전에 행의 ingested_at 열을 현재 시각(UTC)으로 채움(재시도 시 다시 기록)
+    - 저장에 실패하면 행을 버퍼에 되돌리고 예외를 올림(이미 저장한 묶음은 그대로 남음)
+    - 시간 조건은 add() 때 확인하므로, 행이 뜸한 호출자는 due()를 주기적으로 확인해 flush()
+    """
+
+    def __init__(self, storage, batch_rows: int = 0, batch_sec: float = 0, on_flush=None, metrics=None):
+        self.storage = storage
+        self.batch_rows = max(1, int(batch_rows or DEFAULTS["sink_batch_rows"]))
+        self.batch_sec = float(batch_sec or DEFAULTS["sink_batch_sec"])
+        self.on_flush = on_flush
+        self.metrics = metrics
+        self.pending = []
+        self.written = 0
+        self.batches = 0
+        self._since = 0.0
+
+    def add(self, row):
+        if not self.pending:
+            self._since = time.monotonic()
+        self.pending.append(row)
+        if self.due():
+            self.flush()
+
+    def due(self) -> bool:
+        if not self.pending:
+            return False
+        return len(self.pending) >= self.batch_rows or time.monotonic() - self._since >= self.batch_sec
+
+    def seconds_left(self) -> float:
+        """시간 조건까지 남은 초(대기 행이 없으면 batch_sec)."""
+        if not self.pending:
+            return self.batch_sec
+        return max(0.0, self.batch_sec - (time.monotonic() - self._since))
+
+    def flush(self) -> int:
+        rows, self.pending = self.pending, []
+        if not rows:
+            return 0
+        stamp = datetime.now(timezone.utc).isoformat()
+        for r in rows:
+            r.extend([""] * (_INGESTED_I + 1 - len(r)))
+            r[_INGESTED_I] = stamp
+        t0 = time.perf_counter()
+        try:
+            self.storage.append_rows(rows)
+        except Exception:
+            self.pending = rows + self.pending
+            raise
+        finally:
+            if self.metrics is not None:
+                self.metrics.add_time("sheet_write", time.perf_counter() - t0)
+        self.written += len(rows)
+        self.batches += 1
+        if self.on_flush is not None:
+            self.on_flush(rows)
+        return len(rows)
+
+    def close(self) -> int:
+        return self.flush()
+
+
+def open_storage(backend: str = ""):
+    backend = (backend or os.getenv("NEWS_STORAGE", "") or "sheets").strip().lower()
+    if backend == "local":
+        root = os.getenv("NEWS_CACHE_DIR", "").strip() or DEFAULTS["cache_dir"]
+        return LocalStorage(os.getenv("NEWS_LOCAL_DB", "").strip() or os.path.join(root, "news.sqlite3"))
+    if backend == "sheets":
+        return SheetStorage.open()
+    raise ValueError(f"unknown NEWS_STORAGE: {backend}")
@@ -0,0 +1,122 @@
+# hismedi-app/news/tagger.py
+# -*- coding: utf-8 -*-
+"""Aho–Corasick 다중 패턴 태거.
+
+KEYWORDS / NEGATIVE_HINTS 전체를 오토마톤 하나로 컴파일해 제목을 한 번만 훑습니다.
+- 결과는 기존 pick_tags와 동일(부분 문자열 일치, 태그 순서 = KEYWORDS 순서,
+  제외 힌트가 하나라도 있으면 태그 없음)
+- explain()으로 어떤 키워드 때문에 태그가 붙었는지 확인할 수 있습니다.
+"""
+
+from collections import deque
+
+from news.config import KEYWORDS, NEGATIVE_HINTS
+
+
+class KeywordAutomaton:
+    """패턴 목록에 대한 Aho–Corasick 오토마톤(겹치는 일치 포함)."""
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+
+        for pid, pat in enumerate(self.patterns):
+            if not pat:
+                continue
+            node = 0
+            for ch in pat:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                node = nxt
+            self._out[node] = self._out[node] + (pid,)
+
+        # BFS로 실패 링크 구성, 출력은 실패 링크 쪽 출력을 합쳐 둠
+        q = deque(self._goto[0].values())
+        while q:
+            node = q.popleft()
+            for ch, child in self._goto[node].items():
+                q.append(child)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[child] = self._goto[f].get(ch, 0) if node else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def find_ids(self, text: str) -> set:
+        """text에 부분 문자열로 나타나는 패턴 id 집합."""
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set()
+        node = 0
+        for ch in text or "":
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                found.update(out[node])
+        return found
+
+
+class TagMatcher:
+    def __init__(self, keywords: dict, negative_hints):
+        self.tags = list(keywords.keys())
+        self._keywords = {tag: list(kws) for tag, kws in keywords.items()}
+        self.negative_hints = list(negative_hints)
+
+        # 같은 키워드가 여러 태그에 속할 수 있으므로 패턴은 유일하게, 태그 목록은 따로
+        patterns, index = [], {}
+        pattern_tags = []
+        for h in self.negative_hints:
+            if h not in index:
+                index[h] = len(patterns)
+                patterns.append(h)
+                pattern_tags.append([])
+        self._negative_ids = {index[h] for h in self.negative_hints}
+        for ti, tag in enumerate(self.tags):
+            for kw in keywords[tag]:
+                if kw not in index:
+                    index[kw] = len(patterns)
+                    patterns.append(kw)
+                    pattern_tags.append([])
+                if ti not in pattern_tags[index[kw]]:
+                    pattern_tags[index[kw]].append(ti)
+        self._pattern_tags = pattern_tags
+        self._automaton = KeywordAutomaton(patterns)
+
+    def pick(self, text: str):
+        ids = self._automaton.find_ids(text)
+        if not ids or ids & self._negative_ids:
+            return []
+        hit = set()
+        for pid in ids:
+            hit.update(self._pattern_tags[pid])
+        return [self.tags[ti] for ti in sorted(hit)]
+
+    def explain(self, text: str):
+        """(tags, {tag: [일치 키워드...]}, [일치 제외 힌트...]) — 키워드 순서는 KEYWORDS 정의 순서."""
+        ids = self._automaton.find_ids(text)
+        pats = self._automaton.patterns
+        negatives = [pats[pid] for pid in sorted(ids & self._negative_ids)]
+        matched = {}
+        for pid in sorted(ids - self._negative_ids):
+            for ti in self._pattern_tags[pid]:
+                matched.setdefault(self.tags[ti], []).append(pats[pid])
+        matched = {
+            t: sorted(matched[t], key=self._keywords[t].index)
+            for t in self.tags if t in matched
+        }
+        tags = [] if negatives else list(matched)
+        return tags, matched, negatives
+
+    def pick_batch(self, texts):
+        return [self.pick(t) for t in texts]
+
+
+# config 로드 시 한 번만 컴파일
+TAGGER = TagMatcher(KEYWORDS, NEGATIVE_HINTS)
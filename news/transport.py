@@ -0,0 +1,213 @@
+# hismedi-app/news/transport.py
+# -*- coding: utf-8 -*-
+"""공용 HTTP 전송 계층(스크래퍼 / reader.py 공용).
+
+- 연결 풀 + keep-alive Session 하나를 공유(매 요청 TCP/TLS 핸드셰이크 제거)
+- gzip/deflate(+brotli 설치 시 br) 압축 협상
+- 재시도는 재시도 가능한 오류(타임아웃/연결 오류/429/5xx)만, 지수 백오프 + 지터
+- 호스트별 서킷 브레이커: N회 연속 실패한 호스트는 즉시 건너뜀(주기적으로 한 번씩 재시도)
+- 전역/호스트별 동시 요청 상한
+"""
+
+import os, json, time, random, threading
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+
+from news.config import DEFAULTS
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(RuntimeError):
+    """서킷이 열린 호스트에 대한 요청을 시도하지 않았음을 뜻합니다."""
+
+
+# ----------------------------
+# Session(연결 풀)
+# ----------------------------
+_session_lock = threading.Lock()
+_session = None
+
+def get_session() -> requests.Session:
+    global _session
+    with _session_lock:
+        if _session is None:
+            s = requests.Session()
+            pool = max(4, int(DEFAULTS["fetch_workers"]) * 2)
+            adapter = HTTPAdapter(pool_connections=pool, pool_maxsize=pool, max_retries=0)
+            s.mount("http://", adapter)
+            s.mount("https://", adapter)
+            s.headers.update({"Accept-Encoding": ACCEPT_ENCODING, "Connection": "keep-alive"})
+            _session = s
+        return _session
+
+
+# ----------------------------
+# 동시 요청 제한(전역 상한 + 호스트별 예의 제한)
+# ----------------------------
+_limit_lock = threading.Lock()
+_global_slots = threading.BoundedSemaphore(DEFAULTS["fetch_workers"])
+_per_host_limit = DEFAULTS["per_host_limit"]
+_host_slots = {}
+
+def configure_fetch_limits(max_concurrency: int, per_host: int):
+    """동시 HTTP 요청 수의 전역 상한과 호스트별 상한을 설정합니다."""
+    global _global_slots, _per_host_limit
+    with _limit_lock:
+        _global_slots = threading.BoundedSemaphore(max(1, int(max_concurrency)))
+        _per_host_limit = max(1, int(per_host))
+        _host_slots.clear()
+
+@contextmanager
+def _fetch_slot(host: str):
+    with _limit_lock:
+        host_sem = _host_slots.get(host)
+        if host_sem is None:
+            host_sem = _host_slots[host] = threading.BoundedSemaphore(_per_host_limit)
+        global_sem = _global_slots
+    # 호스트 슬롯을 먼저 잡아야 같은 호스트 대기 중에 전역 슬롯을 붙잡고 있지 않습니다.
+    with host_sem, global_sem:
+        yield
+
+
+# ----------------------------
+# 서킷 브레이커(실행 단위 연속 실패 횟수, 디스크에 저장)
+# ----------------------------
+class CircuitBreaker:
+    """호스트별 '연속 실패 실행 수'를 기록합니다.
+    - fails >= threshold 이면 열림(요청하지 않고 CircuitOpenError)
+    - 열린 뒤 probe_every 실행마다 한 번은 시도(half-open), 성공하면 닫힘
+    - 한 실행에서 같은 호스트가 여러 번 실패해도 1회로 셉니다.
+    """
+
+    def __init__(self, path: str = "", threshold: int = 0, probe_every: int = 0):
+        self.path = path
+        self.threshold = max(1, int(threshold or DEFAULTS["breaker_threshold"]))
+        self.probe_every = max(1, int(probe_every or DEFAULTS["breaker_probe_every"]))
+        self._lock = threading.Lock()
+        self._state = {}
+        self._failed_this_run = set()
+        self._decided = {}  # 이번 실행에서 내린 허용/차단 결정(host → bool)
+        if path:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self._state = json.load(f) or {}
+            except (OSError, ValueError):
+                self._state = {}
+
+    def allow(self, host: str) -> bool:
+        with self._lock:
+            if host in self._decided:
+                return self._decided[host]
+            st = self._state.setdefault(host, {"fails": 0, "skipped": 0})
+            ok = st["fails"] < self.threshold
+            if not ok:
+                if st["skipped"] + 1 >= self.probe_every:
+                    st["skipped"] = 0
+                    ok = True
+                else:
+                    st["skipped"] += 1
+            self._decided[host] = ok
+            return ok
+
+    def record_success(self, host: str):
+        with self._lock:
+            if host in self._failed_this_run:
+                return
+            self._state[host] = {"fails": 0, "skipped": 0}
+
+    def record_failure(self, host: str):
+        with self._lock:
+            if host in self._failed_this_run:
+                return
+            self._failed_this_run.add(host)
+            st = self._state.setdefault(host, {"fails": 0, "skipped": 0})
+            st["fails"] += 1
+
+    def open_hosts(self):
+        with self._lock:
+            return sorted(h for h, ok in self._decided.items() if not ok)
+
+    def new_run(self):
+        """상주 모드에서 '실행' 경계(재동기화 주기)마다 호출: 이번 실행의 결정/실패 기록을 비움."""
+        with self._lock:
+            self._decided = {}
+            self._failed_this_run = set()
+
+    def save(self):
+        if not self.path:
+            return
+        d = os.path.dirname(self.path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        tmp = self.path + ".tmp"
+        with self._lock:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._state, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+
+# ----------------------------
+# GET(재시도 가능한 오류만 재시도)
+# ----------------------------
+def _is_retryable(err: Exception) -> bool:
+    if isinstance(err, (requests.Timeout, requests.ConnectionError)):
+        return True
+    if isinstance(err, requests.HTTPError) and err.response is not None:
+        return err.response.status_code in RETRYABLE_STATUS
+    return False
+
+def _backoff_delay(err: Exception, attempt: int, backoff_sec: float) -> float:
+    # 지수 백오프 + full jitter, Retry-After(초)가 있으면 그 값을 하한으로 사용(최대 60초)
+    delay = random.uniform(0, backoff_sec * (2 ** attempt))
+    resp = getattr(err, "response", None)
+    retry_after = resp.headers.get("Retry-After", "") if resp is not None else ""
+    if retry_after.isdigit():
+        delay = max(delay, min(60.0, float(retry_after)))
+    return delay
+
+def fetch(url: str, ua: str = "", timeout_sec: float = 0, retries: int = -1, backoff_sec: float = -1,
+          headers=None, breaker=None, stream: bool = False, breaker_scope: str = "") -> requests.Response:
+    """공용 Session으로 GET합니다.
+    - 304는 오류가 아니므로 그대로 반환합니다(조건부 GET).
+    - 404 등 재시도 불가 오류는 즉시 예외를 올립니다.
+    - breaker_scope를 주면 서킷 브레이커 키를 '<호스트>#<scope>'로 따로 셉니다
+      (같은 호스트의 다른 용도 요청 실패가 피드 수집을 막지 않도록).
+    """
+    ua = ua or DEFAULTS["user_agent"]
+    timeout_sec = timeout_sec or DEFAULTS["fetch_timeout_sec"]
+    retries = DEFAULTS["http_retries"] if retries < 0 else retries
+    backoff_sec = DEFAULTS["http_backoff_sec"] if backoff_sec < 0 else backoff_sec
+
+    host = (urlsplit(url).hostname or "").lower()
+    key = f"{host}#{breaker_scope}" if breaker_scope else host
+    if breaker is not None and not breaker.allow(key):
+        raise CircuitOpenError(f"circuit open: {key}")
+
+    h = {"User-Agent": ua}
+    if headers:
+        h.update(headers)
+    session = get_session()
+    last_err = None
+    for attempt in range(retries + 1):
+        try:
+            with _fetch_slot(host):
+                r = session.get(url, headers=h, timeout=timeout_sec, allow_redirects=True, stream=stream)
+            r.raise_for_status()
+            if breaker is not None:
+                breaker.record_success(key)
+            return r
+        except Exception as e:
+            last_err = e
+            if attempt < retries and _is_retryable(e):
+                time.sleep(_backoff_delay(e, attempt, backoff_sec))
+                continue
+            break
+    if breaker is not None and _is_retryable(last_err):
+        # 4xx 같은 '내용' 오류는 호스트 장애로 보지 않음
+        breaker.record_failure(key)
+    raise last_err
@@ -1,16 +1,26 @@
 import json
 import os
-import re
 from datetime import date, timedelta
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 import gspread
 from google.oauth2.service_account import Credentials
 
+from news import dashboard
+from news.config import DEFAULTS
+from news.dashboard import render_table, time_order
+from news.search import NgramIndex
+from news.snapshot import NewsSnapshot, PUB_KST
+from news.storage import NewsStorage, SheetStorage, open_storage
+
 
 APP_TITLE = "뉴스 모니터"
 DEFAULT_SHEET_ID = os.getenv("GSHEET_ID", "").strip()
+STORAGE_BACKEND = os.getenv("NEWS_STORAGE", "").strip().lower() or "sheets"
+SNAPSHOT_TTL_SEC = 120
+PAGE_SIZE_OPTIONS = [50, 100, 200, 500]
 
 
 def _normalize_private_key(info: dict) -> dict:
@@ -44,23 +54,61 @@ def get_gspread_client():
     return gspread.authorize(creds)
 
 
-@st.cache_data(ttl=120)
-def load_news(sheet_id: str) -> pd.DataFrame:
-    gc = get_gspread_client()
-    sh = gc.open_by_key(sheet_id)
-    ws = sh.get_worksheet(0)
-    return pd.DataFrame(ws.get_all_records())
+@st.cache_resource
+def get_snapshot(sheet_id: str) -> NewsSnapshot:
+    """Local typed Parquet snapshot of the news tab, shared across sessions."""
+    root = os.getenv("NEWS_CACHE_DIR", "").strip() or DEFAULTS["cache_dir"]
+    return NewsSnapshot(os.path.join(root, f"news_app_{sheet_id}.parquet"))
+
+
+@st.cache_resource
+def get_local_storage() -> NewsStorage:
+    """NEWS_STORAGE=local: the scraper's SQLite file, read at disk speed."""
+    return open_storage("local")
+
 
+def load_news(sheet_id: str, force: bool = False):
+    """(Snapshot DataFrame (read-only), its version); refreshed with only the rows added since the last refresh.
 
-def _to_kst(series: pd.Series) -> pd.Series:
-    """Convert various published date formats to KST-naive datetimes (display-friendly).
+    - The pair is read together under the snapshot lock; use this version (never `snapshot.version`)
+      as the memo key for this DataFrame.
 
-    - Accepts strings / mixed values / timezone-aware values.
-    - Unparseable values become NaT (and can be filtered out safely).
+    - Within SNAPSHOT_TTL_SEC the sheet is not touched at all.
+    - `published_kst` is pre-parsed (KST-naive datetime), source/tags are categorical.
     """
-    dt = pd.to_datetime(series, errors="coerce", utc=True)
-    # Convert UTC -> KST, then drop tz for simpler display/filtering
-    return dt.dt.tz_convert("Asia/Seoul").dt.tz_localize(None)
+    def storage():
+        if STORAGE_BACKEND == "local":
+            return get_local_storage()
+        return SheetStorage(get_gspread_client().open_by_key(sheet_id).get_worksheet(0))
+
+    return get_snapshot(sheet_id).refresh(storage, max_age_sec=0 if force else SNAPSHOT_TTL_SEC)
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _time_order(_df: pd.DataFrame, version: int):
+    """Newest-first row positions, computed once per snapshot version."""
+    return time_order(_df)
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def get_search_index(_df: pd.DataFrame, version: int) -> NgramIndex:
+    """Character n-gram index over title/source/tags, built once per snapshot version."""
+    return NgramIndex.from_frame(_df)
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def filter_positions(_df: pd.DataFrame, version: int, date_from: date, date_to: date,
+                     selected_tag: str, kw: str) -> np.ndarray:
+    """Row positions (newest first) matching the filters; memoized per snapshot version + filter state."""
+    return dashboard.filter_positions(_df, _time_order(_df, version), date_from, date_to, selected_tag, kw,
+                                      get_index=lambda: get_search_index(_df, version))
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def render_page(_df: pd.DataFrame, version: int, filter_key: tuple, page: int, page_size: int) -> str:
+    """HTML for one page of the filtered table, built column-wise (no per-row Python loop)."""
+    pos = filter_positions(_df, version, *filter_key)
+    return render_table(_df, pos[(page - 1) * page_size: page * page_size])
 
 
 st.set_page_config(page_title=APP_TITLE, layout="wide")
@@ -84,6 +132,8 @@ st.markdown(
 )
 
 sheet_id = st.secrets.get("GSHEET_ID", "").strip() or DEFAULT_SHEET_ID
+if STORAGE_BACKEND == "local":
+    sheet_id = sheet_id or "local"
 if not sheet_id:
     st.error("GSHEET_ID가 설정되지 않았습니다.")
     st.stop()
@@ -93,7 +143,7 @@ with st.container():
     st.markdown('<div class="top-box">', unsafe_allow_html=True)
 
     # (요청 순서) 시작일 · 종료일 · 태그 · 검색(키워드) · 동기화
-    df = load_news(sheet_id)
+    df, version = load_news(sheet_id)
     if df.empty:
         st.warning("데이터가 없습니다.")
         st.stop()
@@ -102,8 +152,9 @@ with st.container():
     tag_col = "tags" if "tags" in df.columns else None
     tag_options = []
     if tag_col:
+        # 고유값(category)만 나눠서 후보 생성
         _tags = (
-            df[tag_col]
+            pd.Series(df[tag_col].dropna().unique(), dtype=object)
             .fillna("")
             .astype(str)
             .str.split(",")
@@ -128,79 +179,38 @@ with st.container():
         )
     with c5:
         if st.button("🔄 동기화", use_container_width=True):
-            load_news.clear()
+            # 스냅샷은 유지하고 새로 추가된 행만 즉시 가져옴
+            load_news(sheet_id, force=True)
             st.rerun()
 
     st.markdown("</div>", unsafe_allow_html=True)
 
 
-df = load_news(sheet_id)
-if df.empty:
-    st.warning("데이터가 없습니다.")
-    st.stop()
-
-df.columns = [str(c).strip() for c in df.columns]
-
-pub_col = next((c for c in ["published_at", "publishedAt", "pubDate", "date", "발행"] if c in df.columns), None)
-if not pub_col:
+if df[PUB_KST].isna().all():
     st.error("발행일 컬럼을 찾지 못했습니다.")
     st.stop()
 
-df["발행"] = _to_kst(df[pub_col])
-df = df[pd.notna(df["발행"])]
-
-# 날짜 필터
-df = df[(df["발행"].dt.date >= date_from) & (df["발행"].dt.date <= date_to)]
-
-# 태그 필터(단일 선택)
-if tag_col and selected_tag and selected_tag != "전체":
-    df = df[df[tag_col].fillna("").astype(str).str.contains(re.escape(selected_tag))]
-
-# 키워드 검색(선택 시): 제목/출처/태그에서 부분일치
-kw = (keyword or "").strip().lower()
-if kw:
-    title_c = "title" if "title" in df.columns else None
-    source_c = "source" if "source" in df.columns else None
-
-    mask = pd.Series(False, index=df.index)
-    if title_c:
-        mask = mask | df[title_c].fillna("").astype(str).str.lower().str.contains(kw)
-    if source_c:
-        mask = mask | df[source_c].fillna("").astype(str).str.lower().str.contains(kw)
-    if tag_col:
-        mask = mask | df[tag_col].fillna("").astype(str).str.lower().str.contains(kw)
-
-    df = df[mask]
-
-df = df.sort_values("발행", ascending=False)
-
-title_col = "title" if "title" in df.columns else None
-url_col = "url_canonical" if "url_canonical" in df.columns else ("url" if "url" in df.columns else None)
-if not title_col or not url_col:
+if "title" not in df.columns or not ({"url_canonical", "url"} & set(df.columns)):
     st.error("필수 컬럼(title, url/url_canonical)을 찾지 못했습니다.")
     st.stop()
 
-rows = []
-for _, r in df.iterrows():
-    pub_str = r["발행"].strftime("%Y-%m-%d %H:%M")
-    src = str(r.get("source", "")).strip()
-    title = str(r.get(title_col, "")).strip()
-    url = str(r.get(url_col, "")).strip()
-    rows.append(
-        "<tr>"
-        f"<td>{pub_str}</td>"
-        f"<td>{src}</td>"
-        f"<td><a class='newslink' href='{url}' target='_blank' rel='noopener noreferrer'>{title}</a></td>"
-        "</tr>"
-    )
-
-html = (
-    "<div style='max-height:760px; overflow:auto; border:1px solid rgba(49,51,63,.14); border-radius:14px;'>"
-    "<table class='news'>"
-    "<thead><tr><th>발행</th><th>출처</th><th>제목</th></tr></thead>"
-    "<tbody>"
-    + "".join(rows)
-    + "</tbody></table></div>"
-)
-
-st.markdown(html, unsafe_allow_html=True)
+filter_key = (date_from, date_to, selected_tag, " ".join((keyword or "").lower().split()))
+total = len(filter_positions(df, version, *filter_key))
+
+# 필터가 바뀌면 1페이지부터
+if st.session_state.get("_filter_key") != filter_key:
+    st.session_state["_filter_key"] = filter_key
+    st.session_state["page"] = 1
+
+p1, p2, p3 = st.columns([4.6, 1.0, 1.0], vertical_alignment="bottom")
+with p2:
+    page_size = st.selectbox("페이지 크기", options=PAGE_SIZE_OPTIONS, index=1, key="page_size")
+pages = max(1, -(-total // page_size))
+if st.session_state.get("page", 1) > pages:
+    st.session_state["page"] = pages
+with p3:
+    page = st.number_input("페이지", min_value=1, max_value=pages, step=1, key="page")
+with p1:
+    st.caption(f"총 {total:,}건 · {page}/{pages} 페이지")
+
+st.markdown(render_page(df, version, filter_key, int(page), int(page_size)), unsafe_allow_html=True)
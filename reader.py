@@ -1,9 +1,21 @@
 import os
 import json
+import time
+import queue
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+
 import trafilatura  # <--- 이 줄이 반드시 있어야 합니다!
 from google.cloud import bigquery
 from google.oauth2 import service_account
 
+from news.transport import fetch, configure_fetch_limits
+from news.articles import BigQueryArticleWriter, SqliteArticleWriter
+from news.contentcache import ContentCache, FailureCache
+
 # 1. 환경 변수 로드
 target_project_id = os.getenv("BQ_PROJECT_ID")
 sa_json_str = os.getenv("GOOGLE_SERVICE_ACCOUNT_JSON")
@@ -14,51 +26,408 @@ scopes = [
     "https://www.googleapis.com/auth/drive", # 빅쿼리가 외부 시트에 접근하기 위해 필요
 ]
 
-sa_info = json.loads(sa_json_str)
-creds = service_account.Credentials.from_service_account_info(
-    sa_info, 
-    scopes=scopes
-)
+DATASET = "kinetic_field"
 
-# 3. 클라이언트 생성
-client = bigquery.Client(credentials=creds, project=target_project_id)
+# 추출 파이프라인 설정(환경 변수로 조정)
+# - LIMIT 대신 시간 예산: 예산이 끝나면 새 URL은 받지 않고 진행 중인 것만 마무리
+READER_TIME_BUDGET_SEC = int(os.getenv("READER_TIME_BUDGET_SEC", "1200"))
+READER_MAX_ROWS = int(os.getenv("READER_MAX_ROWS", "2000"))
+READER_FETCH_WORKERS = int(os.getenv("READER_FETCH_WORKERS", "16"))
+READER_PER_HOST = int(os.getenv("READER_PER_HOST", "2"))
+READER_EXTRACT_WORKERS = int(os.getenv("READER_EXTRACT_WORKERS", "0"))  # 0 = CPU 수
+READER_QUEUE_SIZE = int(os.getenv("READER_QUEUE_SIZE", "64"))
+# 본문 기록: batch_size건 또는 flush_interval초마다 스테이징 적재 + MERGE 1회
+# - READER_WRITER=sqlite 이면 BigQuery 대신 READER_SQLITE_PATH에 기록(로컬 실행용)
+READER_BATCH_SIZE = int(os.getenv("READER_BATCH_SIZE", "200"))
+READER_FLUSH_INTERVAL_SEC = float(os.getenv("READER_FLUSH_INTERVAL_SEC", "30"))
+READER_WRITER = os.getenv("READER_WRITER", "bigquery").strip().lower()
+READER_SQLITE_PATH = os.getenv("READER_SQLITE_PATH", ".news_cache/articles.sqlite")
+# 시트 → native 증분 동기화: ingested_at 워터마크보다 overlap만큼 앞부터 다시 보며 키로 중복 제거
+READER_SYNC_OVERLAP_MIN = int(os.getenv("READER_SYNC_OVERLAP_MIN", "60"))
+# 원문/본문 로컬 캐시와 실패 백오프(base * 2^(n-1)시간, max_attempts회 실패하면 제외)
+# - READER_REEXTRACT=1 이면 캐시된 본문은 무시하고 캐시된 HTML로 다시 추출
+READER_CACHE_DIR = os.path.join(os.getenv("NEWS_CACHE_DIR", "").strip() or ".news_cache", "reader")
+READER_REEXTRACT = os.getenv("READER_REEXTRACT", "").strip() == "1"
+READER_RETRY_BASE_HOURS = float(os.getenv("READER_RETRY_BASE_HOURS", "6"))
+# 캐시 정리(actions/cache로 매 실행 이어지므로): 이 기간 동안 안 쓰인 파일 삭제, 합계 상한(MB) 초과 시 오래된 것부터
+READER_CACHE_MAX_DAYS = float(os.getenv("READER_CACHE_MAX_DAYS", "30"))
+READER_CACHE_MAX_MB = int(os.getenv("READER_CACHE_MAX_MB", "1024"))
+READER_MAX_ATTEMPTS = int(os.getenv("READER_MAX_ATTEMPTS", "6"))
+# 죽은 URL 기록을 failures.json에 남겨 두는 기간(로컬 모드; BigQuery 경로는 reader_dead_urls 테이블로 옮김)
+READER_DEAD_TTL_DAYS = float(os.getenv("READER_DEAD_TTL_DAYS", "90"))
 
-DATASET = "kinetic_field"
+_DONE = object()
 
-def run_pipeline():
-    # Step A: 시트 데이터 동기화
-    print(f"🔄 [{target_project_id}] 프로젝트 데이터 동기화 중...")
-    sync_sql = f"""
-    INSERT INTO `{target_project_id}.{DATASET}.raw_stream_native` 
+_client = None
+
+def get_client():
+    # 3. 클라이언트 생성(추출 프로세스가 모듈을 다시 import해도 인증하지 않도록 지연 생성)
+    global _client
+    if _client is None:
+        sa_info = json.loads(sa_json_str)
+        creds = service_account.Credentials.from_service_account_info(
+            sa_info,
+            scopes=scopes
+        )
+        _client = bigquery.Client(credentials=creds, project=target_project_id)
+    return _client
+
+
+# ----------------------------
+# 단계별 작업
+# ----------------------------
+def _fetch_one(row):
+    # 공용 전송 계층(연결 풀/압축/재시도 가능한 오류만 재시도), 타임아웃 10초
+    return fetch(row.fetch_url, timeout_sec=10, retries=1).content
+
+def _load_one(row, cache=None, reextract: bool = READER_REEXTRACT):
+    """(html, cached_text): 캐시에 본문이 있으면 (None, text), HTML만 있으면 (html, None)."""
+    if cache is None:
+        return _fetch_one(row), None
+    if not reextract:
+        text = cache.get_text(row.url)
+        if text:
+            return None, text
+    html = cache.get_html(row.url)
+    if html is None:
+        html = _fetch_one(row)
+        cache.put_html(row.url, html)
+    return html, None
+
+def _extract(html):
+    # 프로세스 풀에서 실행(CPU 작업)
+    return trafilatura.extract(html) if html else None
+
+def _process_pool(workers: int) -> ProcessPoolExecutor:
+    """추출용 프로세스 풀. 스레드가 돌고 있는 프로세스를 fork하면 자식이 잡힌 잠금(requests/urllib3, logging)을
+    물려받아 멈출 수 있으므로 forkserver(없으면 spawn)로 시작합니다."""
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return ProcessPoolExecutor(max_workers=workers or None, mp_context=multiprocessing.get_context(method))
+
+
+def extract_pipeline(rows, writer, cache=None, failures=None, time_budget_sec: int = READER_TIME_BUDGET_SEC,
+                     fetch_workers: int = READER_FETCH_WORKERS, extract_workers: int = READER_EXTRACT_WORKERS,
+                     queue_size: int = READER_QUEUE_SIZE):
+    """fetch(스레드 풀) → extract(프로세스 풀) → writer(배치) 3단계 파이프라인.
+    - 단계 사이는 크기 제한 큐(queue_size)로 연결되어 메모리가 일정하게 유지됩니다.
+    - 프로세스 풀은 스레드를 띄우기 전에 메인 스레드에서 만듭니다(_process_pool).
+      풀이 깨지면(BrokenProcessPool) 남은 추출은 건너뛰고(extract_skipped) URL 실패로 기록하지 않습니다.
+    - rows: url, fetch_url 속성을 가진 행
+    - writer: news.articles.ArticleWriter (add / poll / close)
+    - cache: ContentCache(원문/본문 재사용), failures: FailureCache(실패 기록, 성공 시 해제)
+    """
+    deadline = time.monotonic() + time_budget_sec
+    html_q = queue.Queue(maxsize=queue_size)
+    text_q = queue.Queue(maxsize=queue_size)
+    stats = {"fetched": 0, "fetch_failed": 0, "extracted": 0, "empty": 0, "cached_text": 0,
+             "written": 0, "skipped_budget": 0, "extract_skipped": 0}
+    lock = threading.Lock()
+
+    def count(key, n=1):
+        with lock:
+            stats[key] += n
+
+    def failed(url, err):
+        if failures is not None:
+            failures.record_failure(url, err)
+
+    def fetch_stage():
+        try:
+            with ThreadPoolExecutor(max_workers=fetch_workers) as ex:
+                inflight = {}
+                def drain(block):
+                    if not inflight:
+                        return
+                    done, _ = wait(list(inflight), timeout=None if block else 0, return_when=FIRST_COMPLETED)
+                    for f in done:
+                        row = inflight.pop(f)
+                        try:
+                            html, text = f.result()
+                        except Exception as e:
+                            count("fetch_failed")
+                            failed(row.url, e)
+                            print(f"❌ 실패: {row.url[:50]} - {e}")
+                            continue
+                        count("cached_text" if text else "fetched")
+                        html_q.put((row.url, html, text))
+
+                for row in rows:
+                    if time.monotonic() > deadline:
+                        count("skipped_budget")
+                        continue
+                    while len(inflight) >= fetch_workers * 2:
+                        drain(block=True)
+                    inflight[ex.submit(_load_one, row, cache)] = row
+                    drain(block=False)
+                while inflight:
+                    drain(block=True)
+        finally:
+            html_q.put(_DONE)
+
+    def extract_stage(px):
+        broken = False
+        try:
+            pending = deque()
+            max_inflight = max(2, (extract_workers or os.cpu_count() or 2) * 2)
+
+            def skip_broken(url, e):
+                # 풀 장애는 URL 탓이 아니므로 실패 기록 없이 건너뜀(다음 실행에서 다시 시도)
+                nonlocal broken
+                if not broken:
+                    print(f"❌ 추출 프로세스 풀 중단: {e}")
+                broken = True
+                count("extract_skipped")
+
+            def emit(url, f):
+                try:
+                    content = f.result()
+                except BrokenProcessPool as e:
+                    skip_broken(url, e)
+                    return
+                except Exception as e:
+                    content = None
+                    failed(url, e)
+                    print(f"❌ 실패: {url[:50]} - {e}")
+                else:
+                    if not content:
+                        failed(url, "empty extraction")
+                if content:
+                    count("extracted")
+                    if cache is not None:
+                        cache.put_text(url, content)
+                    text_q.put((url, content))
+                else:
+                    count("empty")
+
+            while True:
+                item = html_q.get()
+                if item is _DONE:
+                    break
+                url, html, text = item
+                if text:
+                    text_q.put((url, text))
+                    continue
+                if broken:
+                    # fetch 단계가 막히지 않도록 큐는 계속 비움
+                    count("extract_skipped")
+                    continue
+                try:
+                    pending.append((url, px.submit(_extract, html)))
+                except BrokenProcessPool as e:
+                    skip_broken(url, e)
+                    continue
+                while pending and (len(pending) >= max_inflight or pending[0][1].done()):
+                    emit(*pending.popleft())
+            while pending:
+                emit(*pending.popleft())
+        finally:
+            text_q.put(_DONE)
+
+    px = _process_pool(extract_workers)
+    try:
+        threads = [threading.Thread(target=fetch_stage, daemon=True),
+                   threading.Thread(target=extract_stage, args=(px,), daemon=True)]
+        for t in threads:
+            t.start()
+
+        # writer(메인 스레드): 배치 크기/주기는 writer가 판단, 입력이 뜸해도 주기적으로 poll
+        try:
+            while True:
+                try:
+                    item = text_q.get(timeout=1.0)
+                except queue.Empty:
+                    writer.poll()
+                    continue
+                if item is _DONE:
+                    break
+                writer.add(*item)
+                if failures is not None:
+                    failures.record_success(item[0])
+        finally:
+            writer.close()
+        stats["written"] = writer.written
+        for t in threads:
+            t.join()
+    finally:
+        px.shutdown(wait=True, cancel_futures=True)
+    return stats
+
+
+# ----------------------------
+# 시트(raw_stream_entry) → raw_stream_native 증분 동기화
+# ----------------------------
+def sync_entries(client, overlap_min: int = READER_SYNC_OVERLAP_MIN):
+    """워터마크 이후 추가된 행만 옮깁니다.
+    - 키: ingested_at(스크레이퍼가 저장 직전에 기록하는 추가 시각, 시트에 쌓이는 순서와 같음).
+      published_at은 수집 순서와 무관하므로(Google News 관련도 순, 게시판 백필, 서킷 브레이커 이후 복구) 쓰지 않음
+    - 후보: ingested_at >= 워터마크 - overlap_min분(여러 수집기가 동시에 쓸 때의 순서 역전 대비)
+    - 후보의 url_canonical(없으면 url) / title_hash와 같은 native 행만 골라 중복 제거(스크레이퍼와 같은 키)
+    - 워터마크가 없으면(첫 실행) 전체를 비교. ingested_at이 빈 예전 행은 첫 실행에서만 후보
+    - raw_stream_entry에 ingested_at 열이 없으면(시트 J1 헤더 / 외부 테이블 스키마 미반영) 매번 전체 비교
+    반환: {"scanned": 후보 행 수, "inserted": 삽입 행 수, "watermark": 새 워터마크, "incremental": 증분 여부}
+    """
+    entry = f"`{target_project_id}.{DATASET}.raw_stream_entry`"
+    native = f"`{target_project_id}.{DATASET}.raw_stream_native`"
+    state = f"`{target_project_id}.{DATASET}.sync_state`"
+
+    client.query(f"CREATE TABLE IF NOT EXISTS {state} (name STRING, watermark TIMESTAMP, updated_at TIMESTAMP)").result()
+    cols = client.query(
+        f"SELECT column_name FROM `{target_project_id}.{DATASET}.INFORMATION_SCHEMA.COLUMNS` "
+        "WHERE table_name = 'raw_stream_entry' AND column_name = 'ingested_at'"
+    ).result()
+    incremental = any(True for _ in cols)
+    ingest = "SAFE_CAST(ingested_at AS TIMESTAMP)" if incremental else "CAST(NULL AS TIMESTAMP)"
+
+    script = f"""
+    DECLARE wm TIMESTAMP DEFAULT (SELECT MAX(watermark) FROM {state} WHERE name = 'raw_stream_entry.ingested_at');
+    DECLARE since TIMESTAMP DEFAULT TIMESTAMP_SUB(wm, INTERVAL @overlap_min MINUTE);
+    DECLARE inserted INT64;
+
+    CREATE TEMP TABLE cand AS
+    SELECT *, COALESCE(NULLIF(url_canonical, ''), url) AS dedup_key,
+           SAFE_CAST(published_at AS TIMESTAMP) AS ts, {ingest} AS ingest_ts
+    FROM {entry}
+    WHERE since IS NULL OR {ingest} >= since;
+
+    -- native는 후보와 키가 같은 행의 키 두 열만
+    CREATE TEMP TABLE known AS
+    SELECT COALESCE(NULLIF(url_canonical, ''), url) AS dedup_key, title_hash
+    FROM {native}
+    WHERE COALESCE(NULLIF(url_canonical, ''), url) IN (SELECT dedup_key FROM cand WHERE dedup_key IS NOT NULL)
+       OR title_hash IN (SELECT title_hash FROM cand WHERE COALESCE(title_hash, '') != '');
+
+    INSERT INTO {native}
     (published_at, source, title, url, url_canonical, tags, title_hash, simhash, duplicate_of)
     SELECT published_at, source, title, url, url_canonical, tags, title_hash, simhash, duplicate_of
-    FROM `{target_project_id}.{DATASET}.raw_stream_entry`
-    WHERE url NOT IN (SELECT url FROM `{target_project_id}.{DATASET}.raw_stream_native`)
+    FROM cand
+    WHERE dedup_key NOT IN (SELECT dedup_key FROM known WHERE dedup_key IS NOT NULL)
+      AND (COALESCE(title_hash, '') = ''
+           OR title_hash NOT IN (SELECT title_hash FROM known WHERE title_hash IS NOT NULL))
+    QUALIFY ROW_NUMBER() OVER (PARTITION BY dedup_key ORDER BY ts) = 1;
+    SET inserted = @@row_count;
+
+    -- 미래 시각(시계 오차)은 현재 시각으로 제한
+    MERGE {state} s
+    USING (SELECT 'raw_stream_entry.ingested_at' AS name,
+                  (SELECT MAX(x) FROM UNNEST([wm, (SELECT LEAST(MAX(ingest_ts), CURRENT_TIMESTAMP()) FROM cand)]) x)
+                  AS watermark) n
+    ON s.name = n.name
+    WHEN MATCHED THEN UPDATE SET watermark = n.watermark, updated_at = CURRENT_TIMESTAMP()
+    WHEN NOT MATCHED THEN INSERT (name, watermark, updated_at) VALUES (n.name, n.watermark, CURRENT_TIMESTAMP());
+
+    SELECT (SELECT COUNT(*) FROM cand) AS scanned, inserted,
+           (SELECT watermark FROM {state} WHERE name = 'raw_stream_entry.ingested_at') AS watermark;
     """
-    client.query(sync_sql).result()
+    job_config = bigquery.QueryJobConfig(query_parameters=[
+        bigquery.ScalarQueryParameter("overlap_min", "INT64", int(overlap_min)),
+    ])
+    row = next(iter(client.query(script, job_config=job_config).result()))
+    return {"scanned": row.scanned, "inserted": row.inserted, "watermark": str(row.watermark or ""),
+            "incremental": incremental}
+
+
+def make_writer(client=None):
+    if READER_WRITER == "sqlite":
+        return SqliteArticleWriter(READER_SQLITE_PATH, batch_size=READER_BATCH_SIZE,
+                                   flush_interval_sec=READER_FLUSH_INTERVAL_SEC)
+    return BigQueryArticleWriter(client, f"{target_project_id}.{DATASET}.raw_stream_native",
+                                 batch_size=READER_BATCH_SIZE, flush_interval_sec=READER_FLUSH_INTERVAL_SEC)
 
-    # Step B: 본문 추출 및 업데이트 (LIMIT 180)
-    query = f"SELECT url FROM `{target_project_id}.{DATASET}.raw_stream_native` WHERE article_text IS NULL LIMIT 180"
-    rows = client.query(query).result()
 
-    for row in rows:
+def _open_caches():
+    cache = ContentCache(READER_CACHE_DIR, max_age_days=READER_CACHE_MAX_DAYS, max_bytes=READER_CACHE_MAX_MB * 1024 * 1024)
+    failures = FailureCache(os.path.join(READER_CACHE_DIR, "failures.json"),
+                            base_hours=READER_RETRY_BASE_HOURS, max_attempts=READER_MAX_ATTEMPTS,
+                            dead_ttl_days=READER_DEAD_TTL_DAYS)
+    return cache, failures
+
+
+def publish_dead_urls(client, failures) -> int:
+    """죽은 URL을 reader_dead_urls 테이블로 옮기고 로컬 기록에서 지웁니다(새로 죽은 것만 전송).
+    본문 조회는 이 테이블과의 안티조인으로 제외하므로 쿼리 파라미터에는 백오프 중인 URL만 남습니다."""
+    table = f"`{target_project_id}.{DATASET}.reader_dead_urls`"
+    client.query(f"CREATE TABLE IF NOT EXISTS {table} (url STRING, dead_at TIMESTAMP)").result()
+    urls = failures.dead_urls()
+    if not urls:
+        return 0
+    sql = f"""
+    MERGE {table} t
+    USING (SELECT DISTINCT url FROM UNNEST(@urls) AS url) s
+    ON t.url = s.url
+    WHEN NOT MATCHED THEN INSERT (url, dead_at) VALUES (s.url, CURRENT_TIMESTAMP())
+    """
+    job_config = bigquery.QueryJobConfig(query_parameters=[
+        bigquery.ArrayQueryParameter("urls", "STRING", urls),
+    ])
+    client.query(sql, job_config=job_config).result()
+    failures.forget(urls)
+    return len(urls)
+
+
+def run_local_pipeline():
+    """NEWS_STORAGE=local: BigQuery 없이 로컬 저장소(news.storage.LocalStorage)의 articles 테이블을 채움.
+    스크레이퍼의 append_rows가 articles에 url을 등록하므로 동기화 단계가 필요 없음."""
+    # news.storage는 gspread를 import하므로 로컬 모드에서만 불러옴(requirements2.txt에는 gspread 없음)
+    from news.storage import open_storage
+    storage = open_storage("local")
+    cache, failures = _open_caches()
+    rows = storage.pending_articles(READER_MAX_ROWS, failures.skip_urls())
+    writer = SqliteArticleWriter(storage.path, target_table="articles", batch_size=READER_BATCH_SIZE,
+                                 flush_interval_sec=READER_FLUSH_INTERVAL_SEC)
+
+    configure_fetch_limits(READER_FETCH_WORKERS, READER_PER_HOST)
+    try:
+        stats = extract_pipeline(rows, writer, cache=cache, failures=failures)
+    finally:
+        failures.save()
+        cache.close()
+        storage.close()
+    print(f"📊 {stats}")
+    print(f"🗃️ 캐시 {cache.stats} / 실패 {failures.summary()}")
+
+
+def run_pipeline():
+    if os.getenv("NEWS_STORAGE", "").strip().lower() == "local":
+        return run_local_pipeline()
+    client = get_client()
+
+    # Step A: 시트 데이터 동기화
+    print(f"🔄 [{target_project_id}] 프로젝트 데이터 동기화 중...")
+    sync = sync_entries(client)
+    mode = "증분" if sync["incremental"] else "전체(ingested_at 열 없음)"
+    print(f"🔄 동기화[{mode}]: 후보 {sync['scanned']}건 중 {sync['inserted']}건 삽입 (워터마크 {sync['watermark']})")
+
+    # Step B: 본문 추출 및 업데이트(시간 예산 안에서 최대 READER_MAX_ROWS건)
+    # url_canonical에는 Google News 링크를 해석한 원문 URL이 들어 있으므로 그쪽으로 받음
+    # 실패 백오프 중이거나 죽은 URL은 쿼리 단계에서 제외해 새 기사 자리를 차지하지 않게 함
+    # (죽은 URL은 reader_dead_urls 테이블과 안티조인, 백오프 중인 URL만 배열 파라미터)
+    cache, failures = _open_caches()
+    publish_dead_urls(client, failures)
+    query = f"""
+    SELECT url, COALESCE(NULLIF(url_canonical, ''), url) AS fetch_url
+    FROM `{target_project_id}.{DATASET}.raw_stream_native` n
+    WHERE article_text IS NULL AND url NOT IN UNNEST(@skip_urls)
+      AND NOT EXISTS (SELECT 1 FROM `{target_project_id}.{DATASET}.reader_dead_urls` d WHERE d.url = n.url)
+    LIMIT {READER_MAX_ROWS}
+    """
+    job_config = bigquery.QueryJobConfig(query_parameters=[
+        bigquery.ArrayQueryParameter("skip_urls", "STRING", failures.skip_urls()),
+    ])
+    rows = client.query(query, job_config=job_config).result()
+
+    configure_fetch_limits(READER_FETCH_WORKERS, READER_PER_HOST)
+    try:
+        stats = extract_pipeline(rows, make_writer(client), cache=cache, failures=failures)
+    finally:
         try:
-            # 타임아웃 10초 설정으로 무한 대기 방지
-            res = trafilatura.fetch_url(row.url)
-            content = trafilatura.extract(res) if res else None
-            
-            if content:
-                update_sql = f"UPDATE `{target_project_id}.{DATASET}.raw_stream_native` SET article_text = @content WHERE url = @url"
-                job_config = bigquery.QueryJobConfig(query_parameters=[
-                    bigquery.ScalarQueryParameter("content", "STRING", content),
-                    bigquery.ScalarQueryParameter("url", "STRING", row.url),
-                ])
-                client.query(update_sql, job_config=job_config).result()
-                print(f"✔️ 성공: {row.url[:50]}...")
+            publish_dead_urls(client, failures)
         except Exception as e:
-            print(f"❌ 실패: {row.url[:50]} - {e}")
+            # 옮기지 못한 죽은 URL은 로컬 기록에 남아 다음 실행에서 다시 시도
+            print(f"❌ 죽은 URL 기록 실패: {e}")
+        failures.save()
+        cache.close()
+    print(f"📊 {stats}")
+    print(f"🗃️ 캐시 {cache.stats} / 실패 {failures.summary()}")
 
 if __name__ == "__main__":
     run_pipeline()
-
-